@@ -0,0 +1,154 @@
+"""move recipe tags to association table
+
+Revision ID: 1174f2a58ea7
+Revises: 2c851b1e0d80
+Create Date: 2026-10-17 12:03:18.930462
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1174f2a58ea7'
+down_revision: Union[str, Sequence[str], None] = '2c851b1e0d80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INGREDIENT_NAMES = (
+    "(SELECT group_concat(i.name, ' ') FROM recipe_ingredients ri "
+    "JOIN ingredients i ON i.id = ri.ingredient_id WHERE ri.recipe_id = {ref})"
+)
+TAG_NAMES = (
+    "(SELECT group_concat(tag, ' ') FROM recipe_tags WHERE recipe_id = {ref})"
+)
+
+RECIPE_TRIGGERS = ("recipes_fts_ai", "recipes_fts_au", "recipes_fts_ad")
+
+
+def _index_recipe(tags: str) -> str:
+    return (
+        "INSERT INTO recipes_fts "
+        "(rowid, name, description, instructions, tags, ingredients) "
+        "VALUES (new.id, new.name, new.description, new.instructions, "
+        f"{tags}, {INGREDIENT_NAMES.format(ref='new.id')});"
+    )
+
+
+def _create_recipe_triggers(tags_update_of: str, tags: str) -> None:
+    op.execute(
+        "CREATE TRIGGER recipes_fts_ai AFTER INSERT ON recipes BEGIN "
+        f"{_index_recipe(tags)} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER recipes_fts_au AFTER UPDATE OF {tags_update_of} "
+        "ON recipes BEGIN DELETE FROM recipes_fts WHERE rowid = old.id; "
+        f"{_index_recipe(tags)} END"
+    )
+    op.execute(
+        "CREATE TRIGGER recipes_fts_ad AFTER DELETE ON recipes BEGIN "
+        "DELETE FROM recipes_fts WHERE rowid = old.id; END"
+    )
+
+
+def _drop_recipe_triggers() -> None:
+    for name in RECIPE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def _has_fts() -> bool:
+    # recipes_fts and its triggers only exist on SQLite
+    return op.get_bind().dialect.name == "sqlite"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    recipe_tags = op.create_table('recipe_tags',
+    sa.Column('recipe_id', sa.Integer(), nullable=False),
+    sa.Column('tag', sa.Text(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('recipe_id', 'tag')
+    )
+    op.create_index('ix_recipe_tags_tag_recipe_id', 'recipe_tags', ['tag', 'recipe_id'], unique=True)
+
+    # Copy JSON tags into rows, normalized the same way Recipe.tag_list is
+    conn = op.get_bind()
+    rows = []
+    for recipe_id, raw in conn.execute(
+        sa.text("SELECT id, tags FROM recipes WHERE tags IS NOT NULL")
+    ):
+        try:
+            values = json.loads(raw)
+        except ValueError:
+            continue
+        seen: dict[str, None] = {}
+        for value in values if isinstance(values, list) else []:
+            tag = str(value).strip().lower()
+            if tag:
+                seen.setdefault(tag)
+        rows.extend(
+            {"recipe_id": recipe_id, "tag": tag, "position": position}
+            for position, tag in enumerate(seen)
+        )
+    if rows:
+        op.bulk_insert(recipe_tags, rows)
+
+    # Rebuilding the recipes table drops its triggers; recreate them reading
+    # tags from recipe_tags, which now has its own triggers.
+    if _has_fts():
+        _drop_recipe_triggers()
+    with op.batch_alter_table('recipes', schema=None) as batch_op:
+        batch_op.drop_column('tags')
+    if not _has_fts():
+        return
+    _create_recipe_triggers(
+        "name, description, instructions", TAG_NAMES.format(ref="new.id")
+    )
+    for name, event, ref in (
+        ("recipe_tags_fts_ai", "AFTER INSERT", "new.recipe_id"),
+        ("recipe_tags_fts_ad", "AFTER DELETE", "old.recipe_id"),
+    ):
+        op.execute(
+            f"CREATE TRIGGER {name} {event} ON recipe_tags BEGIN "
+            f"UPDATE recipes_fts SET tags = {TAG_NAMES.format(ref=ref)} "
+            f"WHERE rowid = {ref}; END"
+        )
+    op.execute(
+        "UPDATE recipes_fts SET tags = "
+        + TAG_NAMES.format(ref="recipes_fts.rowid")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _has_fts():
+        op.execute("DROP TRIGGER IF EXISTS recipe_tags_fts_ai")
+        op.execute("DROP TRIGGER IF EXISTS recipe_tags_fts_ad")
+        _drop_recipe_triggers()
+    with op.batch_alter_table('recipes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('tags', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    tags: dict[int, list[str]] = {}
+    for recipe_id, tag in conn.execute(
+        sa.text("SELECT recipe_id, tag FROM recipe_tags ORDER BY recipe_id, position")
+    ):
+        tags.setdefault(recipe_id, []).append(tag)
+    for recipe_id, values in tags.items():
+        conn.execute(
+            sa.text("UPDATE recipes SET tags = :tags WHERE id = :id"),
+            {"tags": json.dumps(values), "id": recipe_id},
+        )
+
+    if _has_fts():
+        _create_recipe_triggers(
+            "name, description, instructions, tags", "new.tags"
+        )
+        op.execute("UPDATE recipes_fts SET tags = "
+                   "(SELECT tags FROM recipes WHERE id = recipes_fts.rowid)")
+    op.drop_index('ix_recipe_tags_tag_recipe_id', table_name='recipe_tags')
+    op.drop_table('recipe_tags')
@@ -0,0 +1,52 @@
+"""add grocery rollup
+
+Revision ID: 15198ee7fc8c
+Revises: c290889c6f78
+Create Date: 2026-10-17 09:12:44.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '15198ee7fc8c'
+down_revision: Union[str, Sequence[str], None] = 'c290889c6f78'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('grocery_rollup',
+    sa.Column('week_plan_id', sa.Integer(), nullable=False),
+    sa.Column('recipe_id', sa.Integer(), nullable=False),
+    sa.Column('ingredient_id', sa.Integer(), nullable=False),
+    sa.Column('unit', sa.String(length=20), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['ingredient_id'], ['ingredients.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['week_plan_id'], ['week_plans.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('week_plan_id', 'recipe_id', 'ingredient_id', 'unit')
+    )
+    op.create_index('ix_grocery_rollup_recipe_id', 'grocery_rollup', ['recipe_id'], unique=False)
+
+    # Backfill from existing plans
+    op.execute(
+        "INSERT INTO grocery_rollup "
+        "(week_plan_id, recipe_id, ingredient_id, unit, quantity) "
+        "SELECT ms.week_plan_id, ms.recipe_id, ri.ingredient_id, ri.unit, "
+        "SUM(ri.quantity) "
+        "FROM meal_slots ms "
+        "JOIN recipe_ingredients ri ON ri.recipe_id = ms.recipe_id "
+        "WHERE ms.is_leftover = false "
+        "GROUP BY ms.week_plan_id, ms.recipe_id, ri.ingredient_id, ri.unit"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_grocery_rollup_recipe_id', table_name='grocery_rollup')
+    op.drop_table('grocery_rollup')
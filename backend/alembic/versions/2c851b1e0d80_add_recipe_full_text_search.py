@@ -0,0 +1,108 @@
+"""add recipe full text search
+
+Revision ID: 2c851b1e0d80
+Revises: 33e1bc82cc28
+Create Date: 2026-10-17 11:20:53.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c851b1e0d80'
+down_revision: Union[str, Sequence[str], None] = '33e1bc82cc28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Space-separated ingredient names for one recipe, correlated on {ref}
+INGREDIENT_NAMES = (
+    "(SELECT group_concat(i.name, ' ') FROM recipe_ingredients ri "
+    "JOIN ingredients i ON i.id = ri.ingredient_id WHERE ri.recipe_id = {ref})"
+)
+
+
+def _index_recipe(ref: str) -> str:
+    return (
+        "INSERT INTO recipes_fts "
+        "(rowid, name, description, instructions, tags, ingredients) "
+        f"VALUES ({ref}.id, {ref}.name, {ref}.description, {ref}.instructions, "
+        f"{ref}.tags, {INGREDIENT_NAMES.format(ref=f'{ref}.id')});"
+    )
+
+
+def _reindex_ingredients(recipe_id: str) -> str:
+    return (
+        f"UPDATE recipes_fts SET ingredients = "
+        f"{INGREDIENT_NAMES.format(ref=recipe_id)} WHERE rowid = {recipe_id};"
+    )
+
+
+TRIGGERS = {
+    "recipes_fts_ai": (
+        "AFTER INSERT ON recipes",
+        _index_recipe("new"),
+    ),
+    "recipes_fts_au": (
+        "AFTER UPDATE OF name, description, instructions, tags ON recipes",
+        "DELETE FROM recipes_fts WHERE rowid = old.id; " + _index_recipe("new"),
+    ),
+    "recipes_fts_ad": (
+        "AFTER DELETE ON recipes",
+        "DELETE FROM recipes_fts WHERE rowid = old.id;",
+    ),
+    "recipe_ingredients_fts_ai": (
+        "AFTER INSERT ON recipe_ingredients",
+        _reindex_ingredients("new.recipe_id"),
+    ),
+    "recipe_ingredients_fts_au": (
+        "AFTER UPDATE OF recipe_id, ingredient_id ON recipe_ingredients",
+        _reindex_ingredients("old.recipe_id") + " "
+        + _reindex_ingredients("new.recipe_id"),
+    ),
+    "recipe_ingredients_fts_ad": (
+        "AFTER DELETE ON recipe_ingredients",
+        _reindex_ingredients("old.recipe_id"),
+    ),
+    "ingredients_fts_au": (
+        "AFTER UPDATE OF name ON ingredients",
+        "UPDATE recipes_fts SET ingredients = "
+        + INGREDIENT_NAMES.format(ref="recipes_fts.rowid")
+        + " WHERE rowid IN (SELECT recipe_id FROM recipe_ingredients "
+        "WHERE ingredient_id = new.id);",
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FTS5 is SQLite only; other backends search with app.services.search's
+    # fallback query instead.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE recipes_fts USING fts5("
+        "name, description, instructions, tags, ingredients, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    for name, (event, body) in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {event} BEGIN {body} END")
+
+    # Backfill existing recipes
+    op.execute(
+        "INSERT INTO recipes_fts "
+        "(rowid, name, description, instructions, tags, ingredients) "
+        "SELECT r.id, r.name, r.description, r.instructions, r.tags, "
+        f"{INGREDIENT_NAMES.format(ref='r.id')} FROM recipes r"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS recipes_fts")
@@ -0,0 +1,32 @@
+"""add ingredient conversion data
+
+Revision ID: 33e1bc82cc28
+Revises: 15198ee7fc8c
+Create Date: 2026-10-17 10:41:07.552918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '33e1bc82cc28'
+down_revision: Union[str, Sequence[str], None] = '15198ee7fc8c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('ingredients', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('density', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('unit_weight', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('ingredients', schema=None) as batch_op:
+        batch_op.drop_column('unit_weight')
+        batch_op.drop_column('density')
@@ -0,0 +1,39 @@
+"""add hot query indexes
+
+Revision ID: 3f8a2c6d1e94
+Revises: e61c5a0d9b47
+Create Date: 2026-10-17 19:42:11.305817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a2c6d1e94'
+down_revision: Union[str, Sequence[str], None] = 'e61c5a0d9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Week reads, slot copies and the chat context list a plan's slots in
+    # date order; the range grocery list filters slots by date and rollup
+    # refreshes find the slots of edited recipes.
+    op.create_index('ix_meal_slots_week_plan_id_date', 'meal_slots', ['week_plan_id', 'date', 'sort_order'], unique=False)
+    op.create_index('ix_meal_slots_date', 'meal_slots', ['date'], unique=False)
+    op.create_index('ix_meal_slots_recipe_id', 'meal_slots', ['recipe_id'], unique=False)
+    op.create_index('ix_chat_messages_session_id_created_at', 'chat_messages', ['session_id', 'created_at'], unique=False)
+    op.create_index('ix_week_template_slots_template_id', 'week_template_slots', ['template_id', 'day_offset', 'sort_order'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_week_template_slots_template_id', table_name='week_template_slots')
+    op.drop_index('ix_chat_messages_session_id_created_at', table_name='chat_messages')
+    op.drop_index('ix_meal_slots_recipe_id', table_name='meal_slots')
+    op.drop_index('ix_meal_slots_date', table_name='meal_slots')
+    op.drop_index('ix_meal_slots_week_plan_id_date', table_name='meal_slots')
@@ -0,0 +1,36 @@
+"""add recipe ingredient position
+
+Revision ID: 5a7c1e9d3b28
+Revises: 8d2e4b7a9c31
+Create Date: 2026-10-17 21:24:12.640187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7c1e9d3b28'
+down_revision: Union[str, Sequence[str], None] = '8d2e4b7a9c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Plain ADD COLUMN rather than batch mode so the FTS triggers survive
+    op.add_column('recipe_ingredients', sa.Column('position', sa.Integer(), server_default='0', nullable=False))
+    # Existing rows keep the order they were listed in, which was id order
+    op.execute(
+        "UPDATE recipe_ingredients SET position = ("
+        "SELECT COUNT(*) FROM recipe_ingredients AS earlier "
+        "WHERE earlier.recipe_id = recipe_ingredients.recipe_id "
+        "AND earlier.id < recipe_ingredients.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('recipe_ingredients', 'position')
@@ -0,0 +1,30 @@
+"""add meal slot version
+
+Revision ID: 7b3e9d2f6a10
+Revises: a4f0b7c31e52
+Create Date: 2026-10-17 18:05:37.214466
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9d2f6a10'
+down_revision: Union[str, Sequence[str], None] = 'a4f0b7c31e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('meal_slots', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('meal_slots', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,32 @@
+"""clear non-positive conversion data
+
+Revision ID: 8d2e4b7a9c31
+Revises: 3f8a2c6d1e94
+Create Date: 2026-10-17 21:05:38.114052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b7a9c31'
+down_revision: Union[str, Sequence[str], None] = '3f8a2c6d1e94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The API now rejects zero and negative conversions; rows saved before
+    # that would divide by zero or flip signs in grocery aggregation.
+    op.execute("UPDATE ingredients SET density = NULL WHERE density <= 0")
+    op.execute("UPDATE ingredients SET unit_weight = NULL WHERE unit_weight <= 0")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Cleared values are not restored
+    pass
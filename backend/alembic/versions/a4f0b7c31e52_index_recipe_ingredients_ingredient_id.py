@@ -0,0 +1,30 @@
+"""index recipe_ingredients.ingredient_id
+
+Revision ID: a4f0b7c31e52
+Revises: d8d435008dba
+Create Date: 2026-10-17 17:10:48.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f0b7c31e52'
+down_revision: Union[str, Sequence[str], None] = 'd8d435008dba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Ingredient merges and the ingredient rename FTS trigger find recipe
+    # rows by ingredient.
+    op.create_index('ix_recipe_ingredients_ingredient_id', 'recipe_ingredients', ['ingredient_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_recipe_ingredients_ingredient_id', table_name='recipe_ingredients')
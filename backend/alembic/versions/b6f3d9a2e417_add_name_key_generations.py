@@ -0,0 +1,37 @@
+"""add name key generations
+
+Revision ID: b6f3d9a2e417
+Revises: 5a7c1e9d3b28
+Create Date: 2026-10-17 21:48:55.902371
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f3d9a2e417'
+down_revision: Union[str, Sequence[str], None] = '5a7c1e9d3b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table = op.create_table('name_key_generations',
+    sa.Column('table_name', sa.Text(), nullable=False),
+    sa.Column('generation', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    # One row per table with in-memory name indexes
+    op.bulk_insert(table, [
+        {'table_name': 'recipes', 'generation': 0},
+        {'table_name': 'ingredients', 'generation': 0},
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('name_key_generations')
@@ -0,0 +1,32 @@
+"""add recipe keyset indexes
+
+Revision ID: c1f498f6fe34
+Revises: 1174f2a58ea7
+Create Date: 2026-10-17 13:37:02.281764
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1f498f6fe34'
+down_revision: Union[str, Sequence[str], None] = '1174f2a58ea7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_recipes_name_id', 'recipes', ['name', 'id'], unique=False)
+    op.create_index('ix_recipes_created_at_id', 'recipes', ['created_at', 'id'], unique=False)
+    op.create_index('ix_recipes_updated_at_id', 'recipes', ['updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_recipes_updated_at_id', table_name='recipes')
+    op.drop_index('ix_recipes_created_at_id', table_name='recipes')
+    op.drop_index('ix_recipes_name_id', table_name='recipes')
@@ -18,12 +18,22 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _shift_week_start(days: int) -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        # SQLite: date(week_start, '-2 days')
+        op.execute(
+            f"UPDATE week_plans SET week_start = date(week_start, '{days:+d} days')"
+        )
+    else:
+        # date + integer is a date in PostgreSQL
+        op.execute(f"UPDATE week_plans SET week_start = week_start + ({days})")
+
+
 def upgrade() -> None:
     # Shift existing Monday-based week_start values back 2 days to Saturday.
-    # SQLite: date(week_start, '-2 days')
-    op.execute("UPDATE week_plans SET week_start = date(week_start, '-2 days')")
+    _shift_week_start(-2)
 
 
 def downgrade() -> None:
     # Reverse: shift Saturday back to Monday (+2 days)
-    op.execute("UPDATE week_plans SET week_start = date(week_start, '+2 days')")
+    _shift_week_start(2)
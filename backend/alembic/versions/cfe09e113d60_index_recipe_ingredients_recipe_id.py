@@ -0,0 +1,30 @@
+"""index recipe_ingredients.recipe_id
+
+Revision ID: cfe09e113d60
+Revises: c1f498f6fe34
+Create Date: 2026-10-17 14:26:40.772031
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cfe09e113d60'
+down_revision: Union[str, Sequence[str], None] = 'c1f498f6fe34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The FTS triggers look up a recipe's ingredients on every
+    # recipe_ingredients write; without this, bulk imports go quadratic.
+    op.create_index('ix_recipe_ingredients_recipe_id', 'recipe_ingredients', ['recipe_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_recipe_ingredients_recipe_id', table_name='recipe_ingredients')
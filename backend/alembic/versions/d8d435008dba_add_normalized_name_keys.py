@@ -0,0 +1,49 @@
+"""add normalized name keys
+
+Revision ID: d8d435008dba
+Revises: cfe09e113d60
+Create Date: 2026-10-17 16:02:11.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8d435008dba'
+down_revision: Union[str, Sequence[str], None] = 'cfe09e113d60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('recipes', 'ingredients')
+
+
+def _normalize(name: str) -> str:
+    # Same rule as app.models.names.normalize_name, frozen for this revision
+    return " ".join(name.lower().split())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    for table in TABLES:
+        # Plain ADD COLUMN rather than batch mode so the recipes FTS triggers
+        # survive; SQLite can't add NOT NULL here, the ORM always sets it.
+        op.add_column(table, sa.Column('name_key', sa.Text(), nullable=True))
+        t = sa.table(table, sa.column('id', sa.Integer), sa.column('name', sa.Text), sa.column('name_key', sa.Text))
+        rows = conn.execute(sa.select(t.c.id, t.c.name)).all()
+        if rows:
+            conn.execute(
+                t.update().where(t.c.id == sa.bindparam('_id')),
+                [{'_id': id_, 'name_key': _normalize(name)} for id_, name in rows],
+            )
+        op.create_index(f'ix_{table}_name_key', table, ['name_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_name_key', table_name=table)
+        op.drop_column(table, 'name_key')
@@ -7,6 +7,25 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 class Settings(BaseSettings):
     database_url: str = f"sqlite:///{PROJECT_ROOT / 'mealz.db'}"
     anthropic_api_key: str = ""
+    recipe_cache_size: int = 512  # serialized recipe responses kept in memory
+    migrate_on_startup: bool = True  # apply pending migrations when the app starts
+
+    # SQLite connection pragmas, applied to every new connection. WAL lets
+    # readers run alongside a writer; NORMAL sync is durable across app
+    # crashes in WAL mode and only risks the last commits on power loss.
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000  # wait this long for a lock, not fail
+    sqlite_cache_size_kib: int = 32768  # page cache per connection
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # bytes; 0 disables
+    sqlite_temp_store: str = "memory"
+
+    # Connection pool for server databases such as PostgreSQL. SQLite keeps
+    # SQLAlchemy's defaults.
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_s: int = 30  # wait for a free connection before failing
+    db_pool_recycle_s: int = 1800  # replace connections older than this
 
     model_config = {"env_file": str(PROJECT_ROOT / ".env"), "extra": "ignore"}
 
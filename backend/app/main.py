@@ -1,13 +1,25 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from starlette.responses import FileResponse
 
-from app.routers import chat, grocery, ingredients, meal_plans, recipes
+from app.config import settings
+from app.migrations import upgrade_to_head
+from app.routers import chat, export, grocery, ingredients, meal_plans, recipes
 
-app = FastAPI(title="Mealz", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.migrate_on_startup and await run_in_threadpool(upgrade_to_head):
+        print("Database migrated to the latest revision")
+    yield
+
+
+app = FastAPI(title="Mealz", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +34,7 @@ app.include_router(ingredients.router)
 app.include_router(meal_plans.router)
 app.include_router(grocery.router)
 app.include_router(chat.router)
+app.include_router(export.router)
 
 
 @app.get("/api/health")
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from app.database import engine
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def upgrade_to_head() -> bool:
+    """Apply pending migrations in process; return whether any ran.
+
+    The common case, a database already at head, loads the revision files
+    to find the head, reads ``alembic_version`` once and returns without
+    running ``env.py`` or opening a migration transaction.
+    """
+    # Imported on first use: alembic is only needed when migrating on
+    # startup, so starts that skip it don't pay for the import
+    from alembic import command
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    with engine.connect() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+    if current == heads:
+        return False
+    command.upgrade(config, "head")
+    return True
@@ -1,14 +1,21 @@
 from app.models.ingredient import Ingredient
-from app.models.recipe import Recipe, RecipeIngredient
-from app.models.meal_plan import WeekPlan, MealSlot
+from app.models.recipe import Recipe, RecipeIngredient, RecipeTag
+from app.models.meal_plan import WeekPlan, MealSlot, WeekTemplate, WeekTemplateSlot
 from app.models.chat import ChatSession, ChatMessage
+from app.models.grocery import GroceryRollup
+from app.models.names import NameKeyGeneration
 
 __all__ = [
     "Ingredient",
     "Recipe",
     "RecipeIngredient",
+    "RecipeTag",
     "WeekPlan",
     "MealSlot",
+    "WeekTemplate",
+    "WeekTemplateSlot",
     "ChatSession",
     "ChatMessage",
+    "GroceryRollup",
+    "NameKeyGeneration",
 ]
@@ -0,0 +1,23 @@
+from sqlalchemy import Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class GroceryRollup(Base):
+    # Summed quantity per (week plan, recipe, ingredient, unit) over the
+    # week's non-leftover slots. Maintained by app.services.grocery_rollup.
+    __tablename__ = "grocery_rollup"
+    __table_args__ = (Index("ix_grocery_rollup_recipe_id", "recipe_id"),)
+
+    week_plan_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("week_plans.id", ondelete="CASCADE"), primary_key=True
+    )
+    recipe_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True
+    )
+    ingredient_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ingredients.id", ondelete="CASCADE"), primary_key=True
+    )
+    unit: Mapped[str] = mapped_column(String(20), primary_key=True)
+    quantity: Mapped[float] = mapped_column(Float, nullable=False)
@@ -1,7 +1,8 @@
-from sqlalchemy import Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Float, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, validates
 
 from app.database import Base
+from app.models.names import name_key_default, normalize_name
 
 
 class Ingredient(Base):
@@ -9,7 +10,19 @@ class Ingredient(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+    # normalize_name(name), indexed for case-insensitive lookups
+    name_key: Mapped[str] = mapped_column(
+        Text, nullable=True, index=True, default=name_key_default
+    )
     category: Mapped[str] = mapped_column(
         String(50), nullable=False, default="other"
     )
     default_unit: Mapped[str] = mapped_column(String(20), nullable=False, default="g")
+    # Optional conversion data used to merge mass, volume and count units
+    density: Mapped[float | None] = mapped_column(Float)  # g per ml
+    unit_weight: Mapped[float | None] = mapped_column(Float)  # g per unit
+
+    @validates("name")
+    def _set_name_key(self, key: str, value: str) -> str:
+        self.name_key = normalize_name(value)
+        return value
@@ -1,6 +1,16 @@
 from datetime import date, datetime
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -23,6 +33,11 @@ class WeekPlan(Base):
 
 class MealSlot(Base):
     __tablename__ = "meal_slots"
+    __table_args__ = (
+        Index("ix_meal_slots_week_plan_id_date", "week_plan_id", "date", "sort_order"),
+        Index("ix_meal_slots_date", "date"),
+        Index("ix_meal_slots_recipe_id", "recipe_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     week_plan_id: Mapped[int] = mapped_column(
@@ -39,14 +54,71 @@ class MealSlot(Base):
     )
     notes: Mapped[str | None] = mapped_column(Text)
     sort_order: Mapped[int] = mapped_column(Integer, default=0)
+    # Bumped by the ORM on every update; clients echo it back so concurrent
+    # edits of the same slot are detected instead of silently overwritten.
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+
+    __mapper_args__ = {"version_id_col": version}
 
     week_plan: Mapped["WeekPlan"] = relationship(back_populates="slots")
-    recipe: Mapped["Recipe | None"] = relationship(
-        "Recipe", foreign_keys=[recipe_id], lazy="joined"
-    )
+    recipe: Mapped["Recipe | None"] = relationship("Recipe", foreign_keys=[recipe_id])
     leftover_source: Mapped["MealSlot | None"] = relationship(
         "MealSlot", remote_side=[id], foreign_keys=[leftover_source_id]
     )
 
 
+class WeekTemplate(Base):
+    # A saved week of slots that can be stamped onto any number of weeks
+    __tablename__ = "week_templates"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+    notes: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now()
+    )
+
+    slots: Mapped[list["WeekTemplateSlot"]] = relationship(
+        back_populates="template",
+        cascade="all, delete-orphan",
+        order_by="(WeekTemplateSlot.day_offset, WeekTemplateSlot.sort_order)",
+    )
+
+
+class WeekTemplateSlot(Base):
+    __tablename__ = "week_template_slots"
+    __table_args__ = (
+        Index(
+            "ix_week_template_slots_template_id",
+            "template_id",
+            "day_offset",
+            "sort_order",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    template_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("week_templates.id", ondelete="CASCADE"), nullable=False
+    )
+    day_offset: Mapped[int] = mapped_column(Integer, nullable=False)  # 0 = Saturday
+    meal_type: Mapped[str] = mapped_column(String(20), default="dinner")
+    recipe_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("recipes.id", ondelete="SET NULL")
+    )
+    is_leftover: Mapped[bool] = mapped_column(Boolean, default=False)
+    leftover_source_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("week_template_slots.id", ondelete="SET NULL")
+    )
+    notes: Mapped[str | None] = mapped_column(Text)
+    sort_order: Mapped[int] = mapped_column(Integer, default=0)
+
+    template: Mapped["WeekTemplate"] = relationship(back_populates="slots")
+    recipe: Mapped["Recipe | None"] = relationship("Recipe", foreign_keys=[recipe_id])
+    leftover_source: Mapped["WeekTemplateSlot | None"] = relationship(
+        "WeekTemplateSlot", remote_side=[id], foreign_keys=[leftover_source_id]
+    )
+
+
 from app.models.recipe import Recipe  # noqa: E402
@@ -0,0 +1,24 @@
+from sqlalchemy import Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+def normalize_name(name: str) -> str:
+    """Lookup key for a name: lowercased, trimmed, inner whitespace collapsed."""
+    return " ".join(name.lower().split())
+
+
+def name_key_default(context) -> str:
+    # Column default for Core inserts that don't go through the ORM validator
+    return normalize_name(context.get_current_parameters()["name"])
+
+
+class NameKeyGeneration(Base):
+    # Bumped in the same transaction as any change to a table's name keys,
+    # so every process can tell when its in-memory name indexes are stale.
+    # Maintained by app.services.name_index.
+    __tablename__ = "name_key_generations"
+
+    table_name: Mapped[str] = mapped_column(Text, primary_key=True)
+    generation: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,47 +1,117 @@
-import json
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    Boolean,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
-from app.database import Base
+from app.database import Base, Timestamp
+from app.models.names import name_key_default, normalize_name
 
 
 class Recipe(Base):
     __tablename__ = "recipes"
+    __table_args__ = (
+        # Keyset pagination orders
+        Index("ix_recipes_name_id", "name", "id"),
+        Index("ix_recipes_created_at_id", "created_at", "id"),
+        Index("ix_recipes_updated_at_id", "updated_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(Text, nullable=False)
+    # normalize_name(name), indexed for case-insensitive lookups
+    name_key: Mapped[str] = mapped_column(
+        Text, nullable=True, index=True, default=name_key_default
+    )
     description: Mapped[str | None] = mapped_column(Text)
     servings: Mapped[int] = mapped_column(Integer, default=2)
     prep_time_min: Mapped[int | None] = mapped_column(Integer)
     cook_time_min: Mapped[int | None] = mapped_column(Integer)
     instructions: Mapped[str | None] = mapped_column(Text)
-    tags: Mapped[str | None] = mapped_column(Text)  # JSON array
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now()
+        Timestamp, server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now()
+        Timestamp, server_default=func.now(), onupdate=func.now()
     )
 
     ingredients: Mapped[list["RecipeIngredient"]] = relationship(
-        back_populates="recipe", cascade="all, delete-orphan"
+        back_populates="recipe",
+        cascade="all, delete-orphan",
+        order_by="RecipeIngredient.position",
     )
+    tag_rows: Mapped[list["RecipeTag"]] = relationship(
+        back_populates="recipe",
+        cascade="all, delete-orphan",
+        order_by="RecipeTag.position",
+    )
+
+    @validates("name")
+    def _set_name_key(self, key: str, value: str) -> str:
+        self.name_key = normalize_name(value)
+        return value
 
     @property
     def tag_list(self) -> list[str]:
-        if self.tags:
-            return json.loads(self.tags)
-        return []
+        return [t.tag for t in self.tag_rows]
 
     @tag_list.setter
     def tag_list(self, value: list[str]) -> None:
-        self.tags = json.dumps(value)
+        tags = normalize_tags(value)
+        if tags == self.tag_list:
+            return
+        # Keep rows for tags that survive so unchanged tags aren't rewritten
+        existing = {t.tag: t for t in self.tag_rows}
+        rows = []
+        for position, tag in enumerate(tags):
+            row = existing.get(tag) or RecipeTag(tag=tag)
+            row.position = position
+            rows.append(row)
+        self.tag_rows = rows
+        # Tags live in their own table, so the row itself may not be
+        # updated; bump it anyway, for caches and updated_at cursors
+        self.updated_at = func.now()
+
+
+def normalize_tags(values: list[str]) -> list[str]:
+    """Lowercase, trim and de-duplicate tags, keeping first-seen order."""
+    seen: dict[str, None] = {}
+    for value in values:
+        tag = value.strip().lower()
+        if tag:
+            seen.setdefault(tag)
+    return list(seen)
+
+
+class RecipeTag(Base):
+    __tablename__ = "recipe_tags"
+    __table_args__ = (
+        Index("ix_recipe_tags_tag_recipe_id", "tag", "recipe_id", unique=True),
+    )
+
+    recipe_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True
+    )
+    tag: Mapped[str] = mapped_column(Text, primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    recipe: Mapped["Recipe"] = relationship(back_populates="tag_rows")
 
 
 class RecipeIngredient(Base):
     __tablename__ = "recipe_ingredients"
+    __table_args__ = (
+        Index("ix_recipe_ingredients_recipe_id", "recipe_id"),
+        Index("ix_recipe_ingredients_ingredient_id", "ingredient_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     recipe_id: Mapped[int] = mapped_column(
@@ -54,6 +124,10 @@ class RecipeIngredient(Base):
     unit: Mapped[str] = mapped_column(String(20), nullable=False, default="g")
     preparation: Mapped[str | None] = mapped_column(Text)
     optional: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Order within the recipe's ingredient list
+    position: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     recipe: Mapped["Recipe"] = relationship(back_populates="ingredients")
     ingredient: Mapped["Ingredient"] = relationship(lazy="joined")
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models.chat import ChatMessage, ChatSession
 from app.schemas.chat import (
     ChatMessageCreate,
@@ -45,9 +46,9 @@ def get_messages(
 async def send_message(
     session_id: int,
     data: ChatMessageCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> StreamingResponse:
-    session = db.query(ChatSession).get(session_id)
+    session = await db.get(ChatSession, session_id)
     if not session:
         raise HTTPException(404, "Chat session not found")
 
@@ -0,0 +1,84 @@
+import zlib
+from collections.abc import Callable, Iterator
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.services.export import (
+    iter_chat_sessions,
+    iter_ingredients,
+    iter_recipes,
+    iter_week_plans,
+)
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+# Bytes buffered before a chunk is sent to the client
+CHUNK_SIZE = 64 * 1024
+
+
+def _ndjson(records: Callable[[Session], Iterator[BaseModel]]) -> Iterator[bytes]:
+    # The stream outlives the request's dependencies, so it owns its session.
+    db = SessionLocal()
+    try:
+        buffer = bytearray()
+        for record in records(db):
+            buffer += record.model_dump_json().encode()
+            buffer += b"\n"
+            if len(buffer) >= CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        db.close()
+
+
+def _gzipped(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def _export(
+    name: str, records: Callable[[Session], Iterator[BaseModel]], gzip: bool
+) -> StreamingResponse:
+    body = _ndjson(records)
+    filename = f"mealz-{name}.ndjson"
+    media_type = "application/x-ndjson"
+    if gzip:
+        body = _gzipped(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/recipes")
+def export_recipes(gzip: bool = Query(False)) -> StreamingResponse:
+    """Recipes with ingredients, in the format POST /api/recipes/import accepts."""
+    return _export("recipes", iter_recipes, gzip)
+
+
+@router.get("/ingredients")
+def export_ingredients(gzip: bool = Query(False)) -> StreamingResponse:
+    return _export("ingredients", iter_ingredients, gzip)
+
+
+@router.get("/meal-plans")
+def export_meal_plans(gzip: bool = Query(False)) -> StreamingResponse:
+    return _export("meal-plans", iter_week_plans, gzip)
+
+
+@router.get("/chat")
+def export_chat(gzip: bool = Query(False)) -> StreamingResponse:
+    return _export("chat", iter_chat_sessions, gzip)
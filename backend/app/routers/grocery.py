@@ -1,14 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.meal_plan import WeekPlan
-from app.schemas.grocery import GroceryList
-from app.services.grocery import generate_grocery_list
+from app.schemas.grocery import GroceryList, GroceryRangeList
+from app.services.grocery import generate_grocery_list, generate_range_grocery_list
 
 router = APIRouter(prefix="/api/meal-plans", tags=["grocery"])
 
 
+@router.get("/grocery-list", response_model=GroceryRangeList)
+def get_range_grocery_list(
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+    db: Session = Depends(get_db),
+) -> GroceryRangeList:
+    if start > end:
+        raise HTTPException(400, "'from' must not be after 'to'")
+    return generate_range_grocery_list(db, start, end)
+
+
 @router.get("/{plan_id}/grocery-list", response_model=GroceryList)
 def get_grocery_list(plan_id: int, db: Session = Depends(get_db)) -> GroceryList:
     plan = db.query(WeekPlan).get(plan_id)
@@ -1,14 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.ingredient import Ingredient
-from app.schemas.ingredient import IngredientCreate, IngredientRead
+from app.models.recipe import RecipeIngredient
+from app.schemas.ingredient import (
+    IngredientCluster,
+    IngredientCreate,
+    IngredientMerge,
+    IngredientMergeResult,
+    IngredientRead,
+    IngredientResolve,
+    IngredientUpdate,
+)
+from app.services.ingredient_dedupe import (
+    DEFAULT_THRESHOLD,
+    find_duplicate_clusters,
+    merge_ingredients,
+)
+from app.services.ingredients import resolve_ingredients
+from app.services.name_index import ingredient_prefixes
+from app.services.recipe_cache import recipe_cache
 
 router = APIRouter(prefix="/api/ingredients", tags=["ingredients"])
 
 CATEGORIES = ["produce", "meat", "dairy", "pantry", "frozen", "bakery", "other"]
 
+DEFAULT_AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 50
+
 
 @router.get("", response_model=list[IngredientRead])
 def list_ingredients(
@@ -24,6 +45,22 @@ def list_ingredients(
     return q.order_by(Ingredient.name).all()
 
 
+@router.get("/autocomplete", response_model=list[IngredientRead])
+def autocomplete_ingredients(
+    q: str = Query(...),
+    limit: int = Query(DEFAULT_AUTOCOMPLETE_LIMIT, ge=1, le=MAX_AUTOCOMPLETE_LIMIT),
+    db: Session = Depends(get_db),
+) -> list[Ingredient]:
+    """Names starting with ``q`` first, then names with a later word starting with it."""
+    ids = ingredient_prefixes.search(db, q, limit)
+    if not ids:
+        return []
+    by_id = {
+        i.id: i for i in db.scalars(select(Ingredient).where(Ingredient.id.in_(ids)))
+    }
+    return [by_id[id_] for id_ in ids if id_ in by_id]
+
+
 @router.post("", response_model=IngredientRead, status_code=201)
 def create_ingredient(
     data: IngredientCreate, db: Session = Depends(get_db)
@@ -38,6 +75,106 @@ def create_ingredient(
     return ingredient
 
 
+@router.post("/resolve", response_model=list[IngredientRead])
+def resolve(
+    data: list[IngredientResolve], db: Session = Depends(get_db)
+) -> list[IngredientRead]:
+    """Find or create ingredients by name, returned in request order."""
+    if any(not item.name.strip() for item in data):
+        raise HTTPException(400, "Ingredient name must not be blank")
+    ingredients = resolve_ingredients(
+        db, [(item.name, item.category, item.unit) for item in data]
+    )
+    # Serialize before commit expires the rows
+    result = [IngredientRead.model_validate(i) for i in ingredients]
+    db.commit()
+    return result
+
+
+@router.get("/duplicates", response_model=list[IngredientCluster])
+def list_duplicates(
+    threshold: float = Query(DEFAULT_THRESHOLD, ge=0.5, le=1.0),
+    db: Session = Depends(get_db),
+) -> list[IngredientCluster]:
+    """Proposed merge clusters of near-duplicate ingredient names."""
+    clusters = find_duplicate_clusters(db, threshold)
+    by_id = {
+        i.id: i
+        for i in db.scalars(
+            select(Ingredient).where(
+                Ingredient.id.in_([i for c in clusters for i in c.ingredient_ids])
+            )
+        )
+    }
+    return [
+        IngredientCluster(
+            target_id=c.target_id,
+            ingredients=[by_id[i] for i in c.ingredient_ids],
+        )
+        for c in clusters
+    ]
+
+
+@router.post("/merge", response_model=IngredientMergeResult)
+def merge(
+    data: list[IngredientMerge], db: Session = Depends(get_db)
+) -> IngredientMergeResult:
+    """Merge each cluster's sources into its target, all in one transaction."""
+    seen: set[int] = set()
+    for m in data:
+        ids = [m.target_id, *m.source_ids]
+        if len(set(ids)) != len(ids) or seen & set(ids):
+            raise HTTPException(400, "Each ingredient may appear in only one merge")
+        seen.update(ids)
+    missing = seen - set(
+        db.scalars(select(Ingredient.id).where(Ingredient.id.in_(seen)))
+    )
+    if missing:
+        raise HTTPException(400, f"Ingredient {min(missing)} not found")
+
+    result = merge_ingredients(db, [(m.target_id, m.source_ids) for m in data])
+    db.commit()
+    recipe_cache.invalidate(*result.recipe_ids)
+    return IngredientMergeResult(
+        merged=result.merged, recipes_updated=len(result.recipe_ids)
+    )
+
+
+@router.put("/{ingredient_id}", response_model=IngredientRead)
+def update_ingredient(
+    ingredient_id: int, data: IngredientUpdate, db: Session = Depends(get_db)
+) -> Ingredient:
+    ingredient = db.query(Ingredient).get(ingredient_id)
+    if not ingredient:
+        raise HTTPException(404, "Ingredient not found")
+    update_data = data.model_dump(exclude_unset=True)
+    if "name" in update_data:
+        existing = (
+            db.query(Ingredient)
+            .filter(
+                Ingredient.name == update_data["name"],
+                Ingredient.id != ingredient_id,
+            )
+            .first()
+        )
+        if existing:
+            raise HTTPException(400, "Ingredient already exists")
+    for field, value in update_data.items():
+        setattr(ingredient, field, value)
+    db.commit()
+    if {"name", "category"} & update_data.keys():
+        # Cached recipe responses embed ingredient names and categories
+        recipe_cache.invalidate(
+            *db.scalars(
+                select(RecipeIngredient.recipe_id)
+                .where(RecipeIngredient.ingredient_id == ingredient_id)
+                .distinct()
+            )
+        )
+    db.refresh(ingredient)
+    return ingredient
+
+
 @router.get("/categories")
 def list_categories() -> list[str]:
     return CATEGORIES
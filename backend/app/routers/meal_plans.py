@@ -1,23 +1,62 @@
-from datetime import date
+from datetime import date, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.database import get_db
-from app.models.meal_plan import MealSlot, WeekPlan
+from app.models.meal_plan import MealSlot, WeekPlan, WeekTemplate, WeekTemplateSlot
+from app.models.recipe import Recipe
 from app.schemas.meal_plan import (
     MealSlotCreate,
     MealSlotRead,
     MealSlotUpdate,
+    SlotBatch,
+    SlotBatchResult,
+    WeekCopy,
+    WeekCopyResult,
     WeekPlanCreate,
     WeekPlanRead,
     WeekPlanUpdate,
+    WeekTemplateCreate,
+    WeekTemplateRead,
+    WeekTemplateSlotRead,
+)
+from app.services.grocery_rollup import refresh_for_slots
+from app.services.meal_plans import (
+    get_or_create_week_plans,
+    plan_slot_specs,
+    stamp_week,
+    template_slot_specs,
+    week_start_for,
 )
 
 router = APIRouter(prefix="/api/meal-plans", tags=["meal-plans"])
 
+# Slot responses only carry the recipe name, so related recipes are loaded
+# as (id, name) instead of full rows with their instructions.
+_PLAN_SLOTS = selectinload(WeekPlan.slots).joinedload(MealSlot.recipe).load_only(
+    Recipe.name
+)
+_TEMPLATE_SLOTS = (
+    selectinload(WeekTemplate.slots)
+    .joinedload(WeekTemplateSlot.recipe)
+    .load_only(Recipe.name)
+)
+
+
+def _recipe_name(db: Session, recipe_id: int | None) -> str | None:
+    if recipe_id is None:
+        return None
+    return db.scalar(select(Recipe.name).where(Recipe.id == recipe_id))
+
 
 def _slot_to_read(slot: MealSlot) -> MealSlotRead:
+    return _slot_read(slot, slot.recipe.name if slot.recipe else None)
+
+
+def _slot_read(slot: MealSlot, recipe_name: str | None) -> MealSlotRead:
     return MealSlotRead(
         id=slot.id,
         week_plan_id=slot.week_plan_id,
@@ -28,7 +67,8 @@ def _slot_to_read(slot: MealSlot) -> MealSlotRead:
         leftover_source_id=slot.leftover_source_id,
         notes=slot.notes,
         sort_order=slot.sort_order,
-        recipe_name=slot.recipe.name if slot.recipe else None,
+        recipe_name=recipe_name,
+        version=slot.version,
     )
 
 
@@ -42,16 +82,122 @@ def _plan_to_read(plan: WeekPlan) -> WeekPlanRead:
     )
 
 
+def _template_to_read(template: WeekTemplate) -> WeekTemplateRead:
+    return WeekTemplateRead(
+        id=template.id,
+        name=template.name,
+        notes=template.notes,
+        slots=[
+            WeekTemplateSlotRead(
+                id=s.id,
+                day_offset=s.day_offset,
+                meal_type=s.meal_type,
+                recipe_id=s.recipe_id,
+                is_leftover=s.is_leftover,
+                leftover_source_id=s.leftover_source_id,
+                notes=s.notes,
+                sort_order=s.sort_order,
+                recipe_name=s.recipe.name if s.recipe else None,
+            )
+            for s in template.slots
+        ],
+        created_at=template.created_at,
+    )
+
+
+def _copy_week(db: Session, specs: list, data: WeekCopy) -> WeekCopyResult:
+    if any(ws != week_start_for(ws) for ws in data.target_week_starts):
+        raise HTTPException(400, "Target week starts must be Saturdays")
+    plans, created = stamp_week(db, specs, data.target_week_starts, data.replace)
+    result = WeekCopyResult(
+        week_plan_ids=[plan.id for plan in plans], slots_created=created
+    )
+    db.commit()
+    return result
+
+
 @router.get("", response_model=WeekPlanRead | None)
 def get_week_plan(
     week_start: date = Query(...), db: Session = Depends(get_db)
 ) -> WeekPlanRead | None:
-    plan = db.query(WeekPlan).filter(WeekPlan.week_start == week_start).first()
+    plan = (
+        db.query(WeekPlan)
+        .options(_PLAN_SLOTS)
+        .filter(WeekPlan.week_start == week_start)
+        .first()
+    )
     if not plan:
         return None
     return _plan_to_read(plan)
 
 
+@router.get("/range", response_model=list[WeekPlanRead])
+def get_week_plans_in_range(
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+    db: Session = Depends(get_db),
+) -> list[WeekPlanRead]:
+    """Every week plan overlapping [from, to], with all of its slots."""
+    if start > end:
+        raise HTTPException(400, "'from' must not be after 'to'")
+    # One flat query over plans, slots and recipe names; the row count is
+    # the number of slots, so a year costs the same round trip as a week.
+    rows = db.execute(
+        select(
+            WeekPlan.id,
+            WeekPlan.week_start,
+            WeekPlan.notes,
+            WeekPlan.created_at,
+            MealSlot.id.label("slot_id"),
+            MealSlot.date,
+            MealSlot.meal_type,
+            MealSlot.recipe_id,
+            MealSlot.is_leftover,
+            MealSlot.leftover_source_id,
+            MealSlot.notes.label("slot_notes"),
+            MealSlot.sort_order,
+            MealSlot.version,
+            Recipe.name.label("recipe_name"),
+        )
+        .outerjoin(MealSlot, MealSlot.week_plan_id == WeekPlan.id)
+        .outerjoin(Recipe, Recipe.id == MealSlot.recipe_id)
+        .where(
+            WeekPlan.week_start > start - timedelta(days=7),
+            WeekPlan.week_start <= end,
+        )
+        .order_by(
+            WeekPlan.week_start, MealSlot.date, MealSlot.sort_order, MealSlot.id
+        )
+    )
+    plans: dict[int, WeekPlanRead] = {}
+    for row in rows:
+        plan = plans.get(row.id)
+        if plan is None:
+            plan = plans[row.id] = WeekPlanRead(
+                id=row.id,
+                week_start=row.week_start,
+                notes=row.notes,
+                created_at=row.created_at,
+            )
+        if row.slot_id is not None:
+            plan.slots.append(
+                MealSlotRead(
+                    id=row.slot_id,
+                    week_plan_id=row.id,
+                    date=row.date,
+                    meal_type=row.meal_type,
+                    recipe_id=row.recipe_id,
+                    is_leftover=row.is_leftover,
+                    leftover_source_id=row.leftover_source_id,
+                    notes=row.slot_notes,
+                    sort_order=row.sort_order,
+                    recipe_name=row.recipe_name,
+                    version=row.version,
+                )
+            )
+    return list(plans.values())
+
+
 @router.post("", response_model=WeekPlanRead, status_code=201)
 def create_week_plan(
     data: WeekPlanCreate, db: Session = Depends(get_db)
@@ -68,6 +214,184 @@ def create_week_plan(
     return _plan_to_read(plan)
 
 
+@router.post("/slots/batch", response_model=SlotBatchResult)
+def apply_slot_batch(
+    data: SlotBatch, db: Session = Depends(get_db)
+) -> SlotBatchResult:
+    """Apply slot creates, updates, moves and deletes in one transaction.
+
+    Every operation on an existing slot carries the slot ``version`` the
+    client last saw; if any slot has changed since, nothing is applied and
+    the request fails with 409.
+    """
+    ops = data.operations
+    slot_ids = [op.slot_id for op in ops if op.op != "create"]
+    if len(set(slot_ids)) != len(slot_ids):
+        raise HTTPException(400, "Each slot may appear in only one operation")
+    slots = {
+        slot.id: slot
+        for slot in db.scalars(select(MealSlot).where(MealSlot.id.in_(slot_ids)))
+    }
+    for op in ops:
+        if op.op == "create":
+            continue
+        slot = slots.get(op.slot_id)
+        if slot is None:
+            raise HTTPException(404, f"Meal slot {op.slot_id} not found")
+        if slot.version != op.version:
+            raise HTTPException(
+                409, f"Meal slot {op.slot_id} was modified by another request"
+            )
+
+    placed = [op for op in ops if op.op in ("create", "move")]
+    plan_ids = {op.week_plan_id for op in placed if op.week_plan_id is not None}
+    found = set(db.scalars(select(WeekPlan.id).where(WeekPlan.id.in_(plan_ids))))
+    if plan_ids - found:
+        raise HTTPException(404, f"Week plan {min(plan_ids - found)} not found")
+    plans_by_week = get_or_create_week_plans(
+        db,
+        (
+            week_start_for(op.slot.date if op.op == "create" else op.date)
+            for op in placed
+            if op.week_plan_id is None
+        ),
+    )
+
+    def plan_for(week_plan_id: int | None, day: date) -> int:
+        return week_plan_id or plans_by_week[week_start_for(day)].id
+
+    touched: list[MealSlot] = []
+    deleted: list[int] = []
+    keys = []
+    for op in ops:
+        if op.op == "create":
+            slot = MealSlot(
+                week_plan_id=plan_for(op.week_plan_id, op.slot.date),
+                **op.slot.model_dump(),
+            )
+            db.add(slot)
+            touched.append(slot)
+            keys.append((slot.week_plan_id, slot.recipe_id))
+            continue
+        slot = slots[op.slot_id]
+        keys.append((slot.week_plan_id, slot.recipe_id))
+        if op.op == "delete":
+            db.delete(slot)
+            deleted.append(slot.id)
+            continue
+        if op.op == "update":
+            for field, value in op.changes.model_dump(exclude_unset=True).items():
+                setattr(slot, field, value)
+        else:
+            slot.week_plan_id = plan_for(op.week_plan_id, op.date)
+            slot.date = op.date
+            if op.sort_order is not None:
+                slot.sort_order = op.sort_order
+        touched.append(slot)
+        keys.append((slot.week_plan_id, slot.recipe_id))
+
+    try:
+        # The flush runs each UPDATE and DELETE with a version check, which
+        # also catches writes that landed after the slots were loaded.
+        db.flush()
+    except StaleDataError:
+        raise HTTPException(409, "A meal slot was modified by another request")
+    refresh_for_slots(db, keys)
+
+    recipe_ids = {slot.recipe_id for slot in touched if slot.recipe_id}
+    names = dict(
+        db.execute(select(Recipe.id, Recipe.name).where(Recipe.id.in_(recipe_ids)))
+        .tuples()
+        .all()
+    )
+    result = SlotBatchResult(
+        slots=[_slot_read(slot, names.get(slot.recipe_id)) for slot in touched],
+        deleted=deleted,
+    )
+    db.commit()
+    return result
+
+
+@router.get("/templates", response_model=list[WeekTemplateRead])
+def list_templates(db: Session = Depends(get_db)) -> list[WeekTemplateRead]:
+    templates = db.scalars(
+        select(WeekTemplate)
+        .options(_TEMPLATE_SLOTS)
+        .order_by(WeekTemplate.name)
+    )
+    return [_template_to_read(t) for t in templates]
+
+
+@router.post("/templates", response_model=WeekTemplateRead, status_code=201)
+def create_template(
+    data: WeekTemplateCreate, db: Session = Depends(get_db)
+) -> WeekTemplateRead:
+    """Save a week plan's slots as a reusable template."""
+    plan = db.get(WeekPlan, data.week_plan_id)
+    if not plan:
+        raise HTTPException(404, "Week plan not found")
+    existing = db.scalar(select(WeekTemplate.id).where(WeekTemplate.name == data.name))
+    if existing:
+        raise HTTPException(400, "Template already exists")
+
+    specs = plan_slot_specs(plan)
+    template_slots = [
+        WeekTemplateSlot(
+            day_offset=spec.day_offset,
+            meal_type=spec.meal_type,
+            recipe_id=spec.recipe_id,
+            is_leftover=spec.is_leftover,
+            notes=spec.notes,
+            sort_order=spec.sort_order,
+        )
+        for spec in specs
+    ]
+    for slot, spec in zip(template_slots, specs):
+        if spec.leftover_of is not None:
+            slot.leftover_source = template_slots[spec.leftover_of]
+    template = WeekTemplate(name=data.name, notes=data.notes, slots=template_slots)
+    db.add(template)
+    db.commit()
+    template = db.scalars(
+        select(WeekTemplate)
+        .options(_TEMPLATE_SLOTS)
+        .where(WeekTemplate.id == template.id)
+        .execution_options(populate_existing=True)
+    ).one()
+    return _template_to_read(template)
+
+
+@router.delete("/templates/{template_id}", status_code=204)
+def delete_template(template_id: int, db: Session = Depends(get_db)) -> None:
+    template = db.get(WeekTemplate, template_id)
+    if not template:
+        raise HTTPException(404, "Template not found")
+    db.delete(template)
+    db.commit()
+
+
+@router.post("/templates/{template_id}/apply", response_model=WeekCopyResult)
+def apply_template(
+    template_id: int, data: WeekCopy, db: Session = Depends(get_db)
+) -> WeekCopyResult:
+    """Stamp a template onto each target week, creating missing plans."""
+    template = db.get(WeekTemplate, template_id)
+    if not template:
+        raise HTTPException(404, "Template not found")
+    return _copy_week(db, template_slot_specs(template), data)
+
+
+@router.post("/{plan_id}/copy", response_model=WeekCopyResult)
+def copy_week_plan(
+    plan_id: int, data: WeekCopy, db: Session = Depends(get_db)
+) -> WeekCopyResult:
+    """Copy a week plan's slots onto each target week, creating missing plans."""
+    plan = db.get(WeekPlan, plan_id)
+    if not plan:
+        raise HTTPException(404, "Week plan not found")
+    return _copy_week(db, plan_slot_specs(plan), data)
+
+
 @router.put("/{plan_id}", response_model=WeekPlanRead)
 def update_week_plan(
     plan_id: int, data: WeekPlanUpdate, db: Session = Depends(get_db)
@@ -78,7 +402,13 @@ def update_week_plan(
     if data.notes is not None:
         plan.notes = data.notes
     db.commit()
-    db.refresh(plan)
+    plan = (
+        db.query(WeekPlan)
+        .options(_PLAN_SLOTS)
+        .populate_existing()
+        .filter(WeekPlan.id == plan_id)
+        .one()
+    )
     return _plan_to_read(plan)
 
 
@@ -91,9 +421,10 @@ def add_meal_slot(
         raise HTTPException(404, "Week plan not found")
     slot = MealSlot(week_plan_id=plan_id, **data.model_dump())
     db.add(slot)
+    refresh_for_slots(db, [(slot.week_plan_id, slot.recipe_id)])
     db.commit()
     db.refresh(slot)
-    return _slot_to_read(slot)
+    return _slot_read(slot, _recipe_name(db, slot.recipe_id))
 
 
 @router.put("/{plan_id}/slots/{slot_id}", response_model=MealSlotRead)
@@ -111,13 +442,15 @@ def update_meal_slot(
     if not slot:
         raise HTTPException(404, "Meal slot not found")
 
+    old_key = (slot.week_plan_id, slot.recipe_id)
     update_data = data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(slot, field, value)
 
+    refresh_for_slots(db, [old_key, (slot.week_plan_id, slot.recipe_id)])
     db.commit()
     db.refresh(slot)
-    return _slot_to_read(slot)
+    return _slot_read(slot, _recipe_name(db, slot.recipe_id))
 
 
 @router.delete("/{plan_id}/slots/{slot_id}", status_code=204)
@@ -131,5 +464,7 @@ def delete_meal_slot(
     )
     if not slot:
         raise HTTPException(404, "Meal slot not found")
+    key = (slot.week_plan_id, slot.recipe_id)
     db.delete(slot)
+    refresh_for_slots(db, [key])
     db.commit()
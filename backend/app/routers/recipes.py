@@ -1,21 +1,62 @@
+import base64
+import binascii
 import json
+from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.orm import Session, load_only, selectinload
 
 from app.database import get_db
-from app.models.ingredient import Ingredient
-from app.models.recipe import Recipe, RecipeIngredient
+from app.models.recipe import Recipe, RecipeTag, normalize_tags
 from app.schemas.recipe import (
+    CacheStats,
     RecipeCreate,
+    RecipeImportError,
+    RecipeImportResult,
+    RecipeIngredientChanges,
     RecipeRead,
     RecipeIngredientRead,
+    RecipePage,
     RecipeSummary,
     RecipeUpdate,
+    RecipeUpdateRead,
+    TagCount,
 )
+from app.services.grocery_rollup import refresh_rollup
+from app.services.recipe_cache import recipe_cache
+from app.services.recipe_ingredients import (
+    insert_recipe_ingredients,
+    missing_ingredient_ids,
+    sync_recipe_ingredients,
+)
+from app.services.recipe_import import IMPORT_BATCH_SIZE, import_batch, iter_ndjson
+from app.services.search import recipe_search_subquery
 
 router = APIRouter(prefix="/api/recipes", tags=["recipes"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+SORT_COLUMNS = {
+    "name": Recipe.name,
+    "created_at": Recipe.created_at,
+    "updated_at": Recipe.updated_at,
+}
+
+# Columns behind RecipeSummary; list endpoints load only these, leaving
+# instructions and the other detail columns unread.
+SUMMARY_COLUMNS = (
+    Recipe.name,
+    Recipe.description,
+    Recipe.servings,
+    Recipe.prep_time_min,
+    Recipe.cook_time_min,
+)
+
 
 def _recipe_to_read(recipe: Recipe) -> RecipeRead:
     return RecipeRead(
@@ -57,21 +98,134 @@ def _recipe_to_summary(recipe: Recipe) -> RecipeSummary:
     )
 
 
+def _filter_by_tags(q, tag: str | None, tags: list[str], tag_mode: str):
+    wanted = normalize_tags(([tag] if tag else []) + tags)
+    if not wanted:
+        return q
+    tagged = select(RecipeTag.recipe_id).where(RecipeTag.tag.in_(wanted))
+    if tag_mode == "all":
+        tagged = tagged.group_by(RecipeTag.recipe_id).having(
+            func.count() == len(wanted)
+        )
+    return q.filter(Recipe.id.in_(tagged))
+
+
+def _check_ingredients_exist(db: Session, ingredients: list) -> None:
+    missing = missing_ingredient_ids(db, (i.ingredient_id for i in ingredients))
+    if missing:
+        raise HTTPException(400, f"Ingredient {missing[0]} not found")
+
+
+def _encode_cursor(sort: str, order: str, recipe: Recipe) -> str:
+    value = getattr(recipe, sort)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, order, value, recipe.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str, order: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        c_sort, c_order, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        if sort != "name":
+            value = datetime.fromisoformat(value)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(400, "Invalid cursor")
+    if (c_sort, c_order) != (sort, order):
+        raise HTTPException(400, "Cursor does not match sort order")
+    return value, last_id
+
+
 @router.get("", response_model=list[RecipeSummary])
 def list_recipes(
     search: str | None = Query(None),
     tag: str | None = Query(None),
+    tags: list[str] = Query([]),
+    tag_mode: Literal["all", "any"] = Query("all"),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
 ) -> list[RecipeSummary]:
-    q = db.query(Recipe)
+    """The first ``limit`` matching recipes; page with ``/page`` for more."""
+    q = db.query(Recipe).options(
+        load_only(*SUMMARY_COLUMNS), selectinload(Recipe.tag_rows)
+    )
+    q = _filter_by_tags(q, tag, tags, tag_mode)
     if search:
-        q = q.filter(Recipe.name.ilike(f"%{search}%"))
-    if tag:
-        q = q.filter(Recipe.tags.ilike(f'%"{tag}"%'))
-    recipes = q.order_by(Recipe.name).all()
+        matches = recipe_search_subquery(search)
+        if matches is None:
+            return []
+        q = q.join(matches, matches.c.recipe_id == Recipe.id).order_by(
+            matches.c.rank
+        )
+    recipes = q.order_by(Recipe.name).limit(limit).all()
     return [_recipe_to_summary(r) for r in recipes]
 
 
+@router.get("/page", response_model=RecipePage)
+def list_recipes_page(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    sort: Literal["name", "created_at", "updated_at"] = Query("name"),
+    order: Literal["asc", "desc"] = Query("asc"),
+    search: str | None = Query(None),
+    tag: str | None = Query(None),
+    tags: list[str] = Query([]),
+    tag_mode: Literal["all", "any"] = Query("all"),
+    include_total: bool = Query(False),
+    db: Session = Depends(get_db),
+) -> RecipePage:
+    # Keyset pagination over (sort column, id): every page is an index range
+    # scan that starts where the previous one stopped, however deep it is.
+    q = _filter_by_tags(db.query(Recipe), tag, tags, tag_mode)
+    if search:
+        matches = recipe_search_subquery(search)
+        if matches is None:
+            return RecipePage(items=[], total=0 if include_total else None)
+        q = q.join(matches, matches.c.recipe_id == Recipe.id)
+
+    total = q.count() if include_total else None
+
+    key = tuple_(SORT_COLUMNS[sort], Recipe.id)
+    if cursor:
+        value, last_id = _decode_cursor(cursor, sort, order)
+        after = tuple_(literal(value, SORT_COLUMNS[sort].type), last_id)
+        q = q.filter(key > after if order == "asc" else key < after)
+    if order == "asc":
+        q = q.order_by(SORT_COLUMNS[sort], Recipe.id)
+    else:
+        q = q.order_by(SORT_COLUMNS[sort].desc(), Recipe.id.desc())
+
+    # The sort column is loaded too, for the next cursor
+    recipes = (
+        q.options(
+            load_only(*SUMMARY_COLUMNS, SORT_COLUMNS[sort]),
+            selectinload(Recipe.tag_rows),
+        )
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(recipes) > limit:
+        recipes = recipes[:limit]
+        next_cursor = _encode_cursor(sort, order, recipes[-1])
+    return RecipePage(
+        items=[_recipe_to_summary(r) for r in recipes],
+        next_cursor=next_cursor,
+        total=total,
+    )
+
+
+@router.get("/tags", response_model=list[TagCount])
+def list_tags(db: Session = Depends(get_db)) -> list[TagCount]:
+    rows = db.execute(
+        select(RecipeTag.tag, func.count().label("count"))
+        .group_by(RecipeTag.tag)
+        .order_by(func.count().desc(), RecipeTag.tag)
+    )
+    return [TagCount(tag=row.tag, count=row.count) for row in rows]
+
+
 @router.post("", response_model=RecipeRead, status_code=201)
 def create_recipe(data: RecipeCreate, db: Session = Depends(get_db)) -> RecipeRead:
     recipe = Recipe(
@@ -81,38 +235,81 @@ def create_recipe(data: RecipeCreate, db: Session = Depends(get_db)) -> RecipeRe
         prep_time_min=data.prep_time_min,
         cook_time_min=data.cook_time_min,
         instructions=data.instructions,
-        tags=json.dumps(data.tags),
+        tag_list=data.tags,
     )
+    _check_ingredients_exist(db, data.ingredients)
     db.add(recipe)
     db.flush()
-
-    for ing_data in data.ingredients:
-        ingredient = db.query(Ingredient).get(ing_data.ingredient_id)
-        if not ingredient:
-            raise HTTPException(400, f"Ingredient {ing_data.ingredient_id} not found")
-        ri = RecipeIngredient(
-            recipe_id=recipe.id,
-            **ing_data.model_dump(),
-        )
-        db.add(ri)
-
+    insert_recipe_ingredients(
+        db, recipe.id, [ing_data.model_dump() for ing_data in data.ingredients]
+    )
     db.commit()
     db.refresh(recipe)
     return _recipe_to_read(recipe)
 
 
+@router.post("/import", response_model=RecipeImportResult)
+async def import_recipes(
+    request: Request, db: Session = Depends(get_db)
+) -> RecipeImportResult:
+    """Bulk-import recipes from an NDJSON body, one RecipeImport per line."""
+    imported = 0
+    errors: list[RecipeImportError] = []
+    batch = []
+
+    async def flush() -> None:
+        nonlocal imported
+        batch_errors = await run_in_threadpool(import_batch, db, batch)
+        imported += len(batch) - len(batch_errors)
+        errors.extend(batch_errors)
+        batch.clear()
+
+    async for line_no, record in iter_ndjson(request.stream()):
+        if isinstance(record, RecipeImportError):
+            errors.append(record)
+            continue
+        batch.append((line_no, record))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await flush()
+    if batch:
+        await flush()
+
+    errors.sort(key=lambda e: e.line)
+    return RecipeImportResult(imported=imported, failed=len(errors), errors=errors)
+
+
+@router.get("/cache/stats", response_model=CacheStats)
+def get_cache_stats() -> CacheStats:
+    return CacheStats(**recipe_cache.stats())
+
+
 @router.get("/{recipe_id}", response_model=RecipeRead)
-def get_recipe(recipe_id: int, db: Session = Depends(get_db)) -> RecipeRead:
-    recipe = db.query(Recipe).get(recipe_id)
-    if not recipe:
+def get_recipe(recipe_id: int, db: Session = Depends(get_db)) -> Response:
+    # A primary-key lookup of updated_at decides whether the cached body is
+    # still current; only misses load the recipe and its ingredients. The
+    # generation is taken first so a body read before a concurrent edit's
+    # invalidation is never cached.
+    generation = recipe_cache.generation(recipe_id)
+    updated_at = db.scalar(select(Recipe.updated_at).where(Recipe.id == recipe_id))
+    if updated_at is None:
         raise HTTPException(404, "Recipe not found")
-    return _recipe_to_read(recipe)
+    body = recipe_cache.get(recipe_id, updated_at)
+    if body is None:
+        recipe = (
+            db.query(Recipe)
+            .options(selectinload(Recipe.ingredients), selectinload(Recipe.tag_rows))
+            .filter(Recipe.id == recipe_id)
+            .one()
+        )
+        body = _recipe_to_read(recipe).model_dump_json().encode()
+        recipe_cache.put(recipe_id, recipe.updated_at, body, generation)
+    return Response(body, media_type="application/json")
 
 
-@router.put("/{recipe_id}", response_model=RecipeRead)
+@router.put("/{recipe_id}", response_model=RecipeUpdateRead)
 def update_recipe(
     recipe_id: int, data: RecipeUpdate, db: Session = Depends(get_db)
-) -> RecipeRead:
+) -> RecipeUpdateRead:
     recipe = db.query(Recipe).get(recipe_id)
     if not recipe:
         raise HTTPException(404, "Recipe not found")
@@ -130,25 +327,26 @@ def update_recipe(
     if data.instructions is not None:
         recipe.instructions = data.instructions
     if data.tags is not None:
-        recipe.tags = json.dumps(data.tags)
+        recipe.tag_list = data.tags
 
+    changes = None
     if data.ingredients is not None:
-        # Replace all ingredients
-        for ri in recipe.ingredients:
-            db.delete(ri)
-        db.flush()
-        for ing_data in data.ingredients:
-            ingredient = db.query(Ingredient).get(ing_data.ingredient_id)
-            if not ingredient:
-                raise HTTPException(
-                    400, f"Ingredient {ing_data.ingredient_id} not found"
-                )
-            ri = RecipeIngredient(recipe_id=recipe.id, **ing_data.model_dump())
-            db.add(ri)
+        _check_ingredients_exist(db, data.ingredients)
+        diff = sync_recipe_ingredients(
+            db, recipe, [i.model_dump() for i in data.ingredients]
+        )
+        if diff:
+            refresh_rollup(db, recipe_ids=[recipe.id])
+        changes = RecipeIngredientChanges(
+            added=diff.added, changed=diff.changed, removed=diff.removed
+        )
 
     db.commit()
+    recipe_cache.invalidate(recipe.id)
     db.refresh(recipe)
-    return _recipe_to_read(recipe)
+    return RecipeUpdateRead(
+        **_recipe_to_read(recipe).model_dump(), ingredient_changes=changes
+    )
 
 
 @router.delete("/{recipe_id}", status_code=204)
@@ -157,4 +355,6 @@ def delete_recipe(recipe_id: int, db: Session = Depends(get_db)) -> None:
     if not recipe:
         raise HTTPException(404, "Recipe not found")
     db.delete(recipe)
+    refresh_rollup(db, recipe_ids=[recipe_id])
     db.commit()
+    recipe_cache.invalidate(recipe_id)
@@ -31,3 +31,7 @@ class ChatMessageRead(BaseModel):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class ChatSessionExport(ChatSessionRead):
+    messages: list[ChatMessageRead] = []
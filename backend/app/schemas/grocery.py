@@ -1,3 +1,5 @@
+import datetime as dt
+
 from pydantic import BaseModel
 
 
@@ -13,3 +15,14 @@ class GroceryItem(BaseModel):
 class GroceryList(BaseModel):
     week_plan_id: int
     categories: dict[str, list[GroceryItem]]
+
+
+class GroceryRangeItem(GroceryItem):
+    weekly_quantities: dict[dt.date, float]  # week_start -> quantity
+
+
+class GroceryRangeList(BaseModel):
+    start: dt.date
+    end: dt.date
+    week_starts: list[dt.date]
+    categories: dict[str, list[GroceryRangeItem]]
@@ -1,17 +1,48 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class IngredientBase(BaseModel):
     name: str
     category: str = "other"
     default_unit: str = "g"
+    density: float | None = Field(None, gt=0)  # g per ml
+    unit_weight: float | None = Field(None, gt=0)  # g per unit
 
 
 class IngredientCreate(IngredientBase):
     pass
 
 
+class IngredientUpdate(BaseModel):
+    name: str | None = None
+    category: str | None = None
+    default_unit: str | None = None
+    density: float | None = Field(None, gt=0)
+    unit_weight: float | None = Field(None, gt=0)
+
+
+class IngredientResolve(BaseModel):
+    name: str
+    category: str = "other"
+    unit: str = "g"  # becomes default_unit when the ingredient is created
+
+
 class IngredientRead(IngredientBase):
     id: int
 
     model_config = {"from_attributes": True}
+
+
+class IngredientCluster(BaseModel):
+    target_id: int  # suggested survivor
+    ingredients: list[IngredientRead]
+
+
+class IngredientMerge(BaseModel):
+    target_id: int
+    source_ids: list[int]
+
+
+class IngredientMergeResult(BaseModel):
+    merged: int
+    recipes_updated: int
@@ -1,7 +1,7 @@
 import datetime as dt
-from typing import Optional
+from typing import Annotated, Literal, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class MealSlotBase(BaseModel):
@@ -32,10 +32,56 @@ class MealSlotRead(MealSlotBase):
     id: int
     week_plan_id: int
     recipe_name: Optional[str] = None
+    version: int
 
     model_config = {"from_attributes": True}
 
 
+class SlotCreateOp(BaseModel):
+    op: Literal["create"]
+    # Defaults to the plan for the slot's week, created if missing
+    week_plan_id: Optional[int] = None
+    slot: MealSlotCreate
+
+
+class SlotUpdateOp(BaseModel):
+    op: Literal["update"]
+    slot_id: int
+    version: int
+    changes: MealSlotUpdate
+
+
+class SlotMoveOp(BaseModel):
+    op: Literal["move"]
+    slot_id: int
+    version: int
+    date: dt.date
+    sort_order: Optional[int] = None
+    # Defaults to the plan for the new date's week, created if missing
+    week_plan_id: Optional[int] = None
+
+
+class SlotDeleteOp(BaseModel):
+    op: Literal["delete"]
+    slot_id: int
+    version: int
+
+
+SlotOperation = Annotated[
+    Union[SlotCreateOp, SlotUpdateOp, SlotMoveOp, SlotDeleteOp],
+    Field(discriminator="op"),
+]
+
+
+class SlotBatch(BaseModel):
+    operations: list[SlotOperation]
+
+
+class SlotBatchResult(BaseModel):
+    slots: list[MealSlotRead]  # created, updated and moved, in operation order
+    deleted: list[int]
+
+
 class WeekPlanBase(BaseModel):
     week_start: dt.date
     notes: Optional[str] = None
@@ -55,3 +101,39 @@ class WeekPlanRead(WeekPlanBase):
     created_at: dt.datetime
 
     model_config = {"from_attributes": True}
+
+
+class WeekCopy(BaseModel):
+    target_week_starts: list[dt.date]
+    replace: bool = False  # delete the targets' existing slots first
+
+
+class WeekCopyResult(BaseModel):
+    week_plan_ids: list[int]  # in target order
+    slots_created: int
+
+
+class WeekTemplateCreate(BaseModel):
+    name: str
+    week_plan_id: int
+    notes: Optional[str] = None
+
+
+class WeekTemplateSlotRead(BaseModel):
+    id: int
+    day_offset: int
+    meal_type: str
+    recipe_id: Optional[int] = None
+    is_leftover: bool
+    leftover_source_id: Optional[int] = None
+    notes: Optional[str] = None
+    sort_order: int
+    recipe_name: Optional[str] = None
+
+
+class WeekTemplateRead(BaseModel):
+    id: int
+    name: str
+    notes: Optional[str] = None
+    slots: list[WeekTemplateSlotRead] = []
+    created_at: dt.datetime
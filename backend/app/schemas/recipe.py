@@ -57,6 +57,16 @@ class RecipeRead(RecipeBase):
     model_config = {"from_attributes": True}
 
 
+class RecipeIngredientChanges(BaseModel):
+    added: list[int] = []  # RecipeIngredient row ids
+    changed: list[int] = []
+    removed: list[int] = []
+
+
+class RecipeUpdateRead(RecipeRead):
+    ingredient_changes: RecipeIngredientChanges | None = None
+
+
 class RecipeSummary(BaseModel):
     id: int
     name: str
@@ -67,3 +77,48 @@ class RecipeSummary(BaseModel):
     tags: list[str] = []
 
     model_config = {"from_attributes": True}
+
+
+class RecipePage(BaseModel):
+    items: list[RecipeSummary]
+    next_cursor: str | None = None  # pass back as ?cursor= for the next page
+    total: int | None = None  # only computed when include_total=true
+
+
+class TagCount(BaseModel):
+    tag: str
+    count: int
+
+
+class RecipeImportIngredient(BaseModel):
+    name: str
+    category: str = "other"
+    quantity: float
+    unit: str = "g"
+    preparation: str | None = None
+    optional: bool = False
+
+
+class RecipeImport(RecipeBase):
+    # Ingredients are referenced by name so records are portable between
+    # databases; unknown names are created.
+    ingredients: list[RecipeImportIngredient] = []
+
+
+class RecipeImportError(BaseModel):
+    line: int
+    error: str
+
+
+class RecipeImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[RecipeImportError]
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    invalidations: int
+    size: int
+    max_size: int
@@ -1,12 +1,17 @@
 import json
+import logging
+import time
 import traceback
 from collections.abc import AsyncGenerator
 from datetime import date
 
-import anthropic
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.config import settings
+from app.database import SessionLocal
 from app.models.chat import ChatMessage, ChatSession
 from app.models.meal_plan import MealSlot, WeekPlan
 from app.models.recipe import Recipe
@@ -16,6 +21,8 @@ from app.services.tool_executor import (
     execute_update_recipe,
 )
 
+logger = logging.getLogger(__name__)
+
 SYSTEM_PROMPT = """You are a helpful sous chef assistant for a couple planning their weekly meals. Your role is to:
 
 - Help plan meals for 2 people
@@ -245,21 +252,26 @@ TOOL_LABELS = {
 }
 
 
-def build_context_messages(db: Session, session: ChatSession) -> str:
+async def build_context_messages(db: AsyncSession, session: ChatSession) -> str:
     context_parts = []
 
     if session.context_type == "week_plan" and session.week_plan_id:
-        plan = db.query(WeekPlan).get(session.week_plan_id)
+        plan = await db.get(WeekPlan, session.week_plan_id)
         if plan:
-            slots = (
-                db.query(MealSlot)
-                .filter(MealSlot.week_plan_id == plan.id)
+            slots = await db.execute(
+                select(
+                    MealSlot.date,
+                    MealSlot.meal_type,
+                    MealSlot.is_leftover,
+                    Recipe.name.label("recipe_name"),
+                )
+                .outerjoin(Recipe, Recipe.id == MealSlot.recipe_id)
+                .where(MealSlot.week_plan_id == plan.id)
                 .order_by(MealSlot.date, MealSlot.sort_order)
-                .all()
             )
             meals_text = []
             for slot in slots:
-                name = slot.recipe.name if slot.recipe else "No recipe"
+                name = slot.recipe_name or "No recipe"
                 leftover = " (leftover)" if slot.is_leftover else ""
                 meals_text.append(
                     f"- {slot.date} {slot.meal_type}: {name}{leftover}"
@@ -271,7 +283,9 @@ def build_context_messages(db: Session, session: ChatSession) -> str:
                 )
 
     elif session.context_type == "recipe" and session.recipe_id:
-        recipe = db.query(Recipe).get(session.recipe_id)
+        recipe = await db.get(
+            Recipe, session.recipe_id, options=[selectinload(Recipe.ingredients)]
+        )
         if recipe:
             ingredients_text = []
             for ri in recipe.ingredients:
@@ -290,42 +304,49 @@ def build_context_messages(db: Session, session: ChatSession) -> str:
     return "\n\n".join(context_parts)
 
 
-def _execute_tool(db: Session, name: str, input_data: dict) -> dict:
-    if name == "create_recipe":
-        return execute_create_recipe(db, input_data)
-    elif name == "update_recipe":
-        return execute_update_recipe(db, input_data)
-    elif name == "add_to_plan":
-        return execute_add_to_plan(db, input_data)
-    else:
-        raise ValueError(f"Unknown tool: {name}")
+def _execute_tool(name: str, input_data: dict) -> dict:
+    # Each call gets its own session, so the tool reads current rows rather
+    # than whatever the chat's async session has loaded.
+    db = SessionLocal()
+    try:
+        if name == "create_recipe":
+            return execute_create_recipe(db, input_data)
+        elif name == "update_recipe":
+            return execute_update_recipe(db, input_data)
+        elif name == "add_to_plan":
+            return execute_add_to_plan(db, input_data)
+        else:
+            raise ValueError(f"Unknown tool: {name}")
+    finally:
+        db.close()
 
 
 async def stream_chat_response(
-    db: Session, session: ChatSession, user_message: str
+    db: AsyncSession, session: ChatSession, user_message: str
 ) -> AsyncGenerator[str, None]:
     # Save user message
     user_msg = ChatMessage(
         session_id=session.id, role="user", content=user_message
     )
     db.add(user_msg)
-    db.commit()
+    await db.commit()
 
     # Build messages for API
     today = date.today()
     weekday = today.strftime("%A")
-    context = build_context_messages(db, session)
+    context = await build_context_messages(db, session)
     system = SYSTEM_PROMPT + f"\n\nToday is {weekday}, {today.isoformat()}. Use this to resolve relative dates like 'tomorrow', 'next Monday', 'this weekend', etc. The planning week runs Saturday through Friday."
     if context:
         system += f"\n\n{context}"
 
     # Get recent messages (sliding window)
-    recent_messages = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.session_id == session.id)
-        .order_by(ChatMessage.created_at.desc())
-        .limit(20)
-        .all()
+    recent_messages = list(
+        await db.scalars(
+            select(ChatMessage)
+            .where(ChatMessage.session_id == session.id)
+            .order_by(ChatMessage.created_at.desc())
+            .limit(20)
+        )
     )
     recent_messages.reverse()
 
@@ -333,35 +354,45 @@ async def stream_chat_response(
         {"role": msg.role, "content": msg.content} for msg in recent_messages
     ]
 
-    client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+    # Imported on first use: the SDK alone takes over a second to import,
+    # which would otherwise be paid on every cold start
+    import anthropic
+
+    client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
     full_text_response = ""
 
+    # Time to first token, from when the model is first called
+    started = time.perf_counter()
+    first_token_ms = None
+
     # Tool-use loop
     while True:
-        # Collect the full response (text + tool_use blocks)
-        response = client.messages.create(
+        # Stream the response: text deltas are forwarded as they arrive and
+        # each tool call is announced as soon as its input is complete
+        async with client.messages.stream(
             model="claude-haiku-4-5-20251001",
             max_tokens=2048,
             system=system,
             messages=api_messages,
             tools=TOOLS,
-        )
-
-        # Process content blocks — stream text, track tool calls
+        ) as stream:
+            async for event in stream:
+                if event.type == "text":
+                    if first_token_ms is None:
+                        first_token_ms = round(
+                            (time.perf_counter() - started) * 1000
+                        )
+                    full_text_response += event.text
+                    yield f"data: {json.dumps({'type': 'text', 'content': event.text})}\n\n"
+                elif (
+                    event.type == "content_block_stop"
+                    and event.content_block.type == "tool_use"
+                ):
+                    block = event.content_block
+                    label = TOOL_LABELS.get(block.name, f"Using {block.name}...")
+                    yield f"data: {json.dumps({'type': 'tool_start', 'tool': block.name, 'label': label})}\n\n"
+            response = await stream.get_final_message()
         assistant_content = response.content
-        for block in assistant_content:
-            if block.type == "text":
-                # Yield text in small chunks for streaming feel
-                text = block.text
-                full_text_response += text
-                # Send in chunks to simulate streaming
-                chunk_size = 20
-                for i in range(0, len(text), chunk_size):
-                    chunk = text[i : i + chunk_size]
-                    yield f"data: {json.dumps({'type': 'text', 'content': chunk})}\n\n"
-            elif block.type == "tool_use":
-                label = TOOL_LABELS.get(block.name, f"Using {block.name}...")
-                yield f"data: {json.dumps({'type': 'tool_start', 'tool': block.name, 'label': label})}\n\n"
 
         if response.stop_reason != "tool_use":
             break
@@ -371,7 +402,12 @@ async def stream_chat_response(
         for block in assistant_content:
             if block.type == "tool_use":
                 try:
-                    result = _execute_tool(db, block.name, block.input)
+                    # The tool executors are synchronous and may block, e.g.
+                    # building a name index on first use; run them in a
+                    # worker thread so the event loop keeps serving requests
+                    result = await run_in_threadpool(
+                        _execute_tool, block.name, block.input
+                    )
                     tool_results.append(
                         {
                             "type": "tool_result",
@@ -403,6 +439,10 @@ async def stream_chat_response(
             session_id=session.id, role="assistant", content=full_text_response
         )
         db.add(assistant_msg)
-        db.commit()
+        await db.commit()
 
-    yield f"data: {json.dumps({'type': 'done'})}\n\n"
+    if first_token_ms is not None:
+        logger.debug(
+            "Chat session %s: first token after %s ms", session.id, first_token_ms
+        )
+    yield f"data: {json.dumps({'type': 'done', 'first_token_ms': first_token_ms})}\n\n"
@@ -0,0 +1,132 @@
+from collections import defaultdict
+from collections.abc import Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.chat import ChatMessage, ChatSession
+from app.models.ingredient import Ingredient
+from app.models.meal_plan import MealSlot, WeekPlan
+from app.models.recipe import Recipe, RecipeIngredient, RecipeTag
+from app.schemas.chat import ChatMessageRead, ChatSessionExport
+from app.schemas.ingredient import IngredientRead
+from app.schemas.meal_plan import MealSlotRead, WeekPlanRead
+from app.schemas.recipe import RecipeImport, RecipeImportIngredient
+
+# Parent rows read per round trip; children are fetched per batch with IN
+EXPORT_BATCH_SIZE = 500
+
+
+def _batches(db: Session, model, batch_size: int) -> Iterator[list]:
+    # Keyset over the primary key, so each batch is an index range scan and
+    # no cursor stays open while the client is consuming the stream.
+    last_id = 0
+    while True:
+        rows = db.scalars(
+            select(model)
+            .where(model.id > last_id)
+            .order_by(model.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+        db.expunge_all()
+
+
+def iter_recipes(
+    db: Session, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[RecipeImport]:
+    """Recipes in the bulk-import format, so exports can be re-imported."""
+    for recipes in _batches(db, Recipe, batch_size):
+        ids = [r.id for r in recipes]
+        tags = defaultdict(list)
+        for row in db.execute(
+            select(RecipeTag.recipe_id, RecipeTag.tag)
+            .where(RecipeTag.recipe_id.in_(ids))
+            .order_by(RecipeTag.recipe_id, RecipeTag.position)
+        ):
+            tags[row.recipe_id].append(row.tag)
+        ingredients = defaultdict(list)
+        for row in db.execute(
+            select(RecipeIngredient, Ingredient.name, Ingredient.category)
+            .join(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+            .where(RecipeIngredient.recipe_id.in_(ids))
+            .order_by(RecipeIngredient.recipe_id, RecipeIngredient.position)
+        ):
+            ri = row.RecipeIngredient
+            ingredients[ri.recipe_id].append(
+                RecipeImportIngredient(
+                    name=row.name,
+                    category=row.category,
+                    quantity=ri.quantity,
+                    unit=ri.unit,
+                    preparation=ri.preparation,
+                    optional=ri.optional,
+                )
+            )
+        for r in recipes:
+            yield RecipeImport(
+                name=r.name,
+                description=r.description,
+                servings=r.servings,
+                prep_time_min=r.prep_time_min,
+                cook_time_min=r.cook_time_min,
+                instructions=r.instructions,
+                tags=tags[r.id],
+                ingredients=ingredients[r.id],
+            )
+
+
+def iter_ingredients(
+    db: Session, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[IngredientRead]:
+    for ingredients in _batches(db, Ingredient, batch_size):
+        yield from (IngredientRead.model_validate(i) for i in ingredients)
+
+
+def iter_week_plans(
+    db: Session, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[WeekPlanRead]:
+    for plans in _batches(db, WeekPlan, batch_size):
+        slots = defaultdict(list)
+        for row in db.execute(
+            select(MealSlot.__table__, Recipe.name.label("recipe_name"))
+            .outerjoin(Recipe, Recipe.id == MealSlot.recipe_id)
+            .where(MealSlot.week_plan_id.in_([p.id for p in plans]))
+            .order_by(MealSlot.week_plan_id, MealSlot.date, MealSlot.sort_order)
+        ):
+            slots[row.week_plan_id].append(MealSlotRead.model_validate(row))
+        for plan in plans:
+            yield WeekPlanRead(
+                id=plan.id,
+                week_start=plan.week_start,
+                notes=plan.notes,
+                slots=slots[plan.id],
+                created_at=plan.created_at,
+            )
+
+
+def iter_chat_sessions(
+    db: Session, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[ChatSessionExport]:
+    for sessions in _batches(db, ChatSession, batch_size):
+        messages = defaultdict(list)
+        for message in db.scalars(
+            select(ChatMessage)
+            .where(ChatMessage.session_id.in_([s.id for s in sessions]))
+            .order_by(ChatMessage.session_id, ChatMessage.created_at, ChatMessage.id)
+        ):
+            messages[message.session_id].append(
+                ChatMessageRead.model_validate(message)
+            )
+        for session in sessions:
+            yield ChatSessionExport(
+                id=session.id,
+                context_type=session.context_type,
+                week_plan_id=session.week_plan_id,
+                recipe_id=session.recipe_id,
+                created_at=session.created_at,
+                messages=messages[session.id],
+            )
@@ -1,60 +1,164 @@
 from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
 
+from sqlalchemy import Select, func, select
 from sqlalchemy.orm import Session
 
+from app.models.grocery import GroceryRollup
+from app.models.ingredient import Ingredient
 from app.models.meal_plan import MealSlot, WeekPlan
-from app.models.recipe import RecipeIngredient
-from app.schemas.grocery import GroceryItem, GroceryList
+from app.models.recipe import Recipe, RecipeIngredient
+from app.schemas.grocery import (
+    GroceryItem,
+    GroceryList,
+    GroceryRangeItem,
+    GroceryRangeList,
+)
+from app.services.units import normalized
 
+# Rows fetched per round trip when streaming a range aggregation.
+RANGE_BATCH_SIZE = 500
 
-def generate_grocery_list(db: Session, week_plan: WeekPlan) -> GroceryList:
-    # Collect all non-leftover slots with recipes
-    slots = (
-        db.query(MealSlot)
-        .filter(
-            MealSlot.week_plan_id == week_plan.id,
-            MealSlot.is_leftover == False,  # noqa: E712
-            MealSlot.recipe_id.isnot(None),
-        )
-        .all()
+
+def _normalized_lines(quantity, unit) -> list:
+    # Per-row columns shared by the live and rollup paths, with quantity and
+    # unit converted to the ingredient's canonical unit in SQL.
+    norm_quantity, norm_unit = normalized(
+        quantity,
+        unit,
+        Ingredient.default_unit,
+        Ingredient.density,
+        Ingredient.unit_weight,
     )
+    return [
+        Ingredient.id.label("ingredient_id"),
+        Ingredient.name.label("ingredient_name"),
+        Ingredient.category.label("category"),
+        norm_unit.label("unit"),
+        Recipe.id.label("recipe_id"),
+        Recipe.name.label("recipe_name"),
+        norm_quantity.label("quantity"),
+    ]
+
 
-    # Aggregate ingredients: key = (ingredient_id, unit)
-    aggregated: dict[tuple[int, str], dict] = {}
-    for slot in slots:
-        recipe_ingredients = (
-            db.query(RecipeIngredient)
-            .filter(RecipeIngredient.recipe_id == slot.recipe_id)
-            .all()
+def _slot_lines() -> Select:
+    # One row per recipe ingredient of every non-leftover slot
+    return (
+        select(
+            *_normalized_lines(RecipeIngredient.quantity, RecipeIngredient.unit),
+            WeekPlan.week_start.label("week_start"),
         )
-        for ri in recipe_ingredients:
-            key = (ri.ingredient_id, ri.unit)
-            if key not in aggregated:
-                aggregated[key] = {
-                    "ingredient_id": ri.ingredient_id,
-                    "ingredient_name": ri.ingredient.name,
-                    "category": ri.ingredient.category,
-                    "total_quantity": 0.0,
-                    "unit": ri.unit,
-                    "recipes": set(),
-                }
-            aggregated[key]["total_quantity"] += ri.quantity
-            aggregated[key]["recipes"].add(slot.recipe.name)
-
-    # Group by category
+        .select_from(MealSlot)
+        .join(WeekPlan, WeekPlan.id == MealSlot.week_plan_id)
+        .join(RecipeIngredient, RecipeIngredient.recipe_id == MealSlot.recipe_id)
+        .join(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+        .join(Recipe, Recipe.id == MealSlot.recipe_id)
+        .where(MealSlot.is_leftover == False)  # noqa: E712
+    )
+
+
+def _rollup_lines(week_plan_id: int) -> Select:
+    # Read through the rollup's (week_plan_id, ...) primary key
+    return (
+        select(*_normalized_lines(GroceryRollup.quantity, GroceryRollup.unit))
+        .select_from(GroceryRollup)
+        .join(Ingredient, Ingredient.id == GroceryRollup.ingredient_id)
+        .join(Recipe, Recipe.id == GroceryRollup.recipe_id)
+        .where(GroceryRollup.week_plan_id == week_plan_id)
+    )
+
+
+def _summarize(lines: Select, *extra_keys: str) -> Select:
+    # One row per (ingredient, canonical unit, recipe[, extra keys]). Ordering
+    # lets rows be folded into grocery items in a single pass without holding
+    # the result set.
+    sub = lines.subquery()
+    keys = [
+        sub.c.ingredient_id,
+        sub.c.ingredient_name,
+        sub.c.category,
+        sub.c.unit,
+        sub.c.recipe_id,
+        sub.c.recipe_name,
+        *(sub.c[k] for k in extra_keys),
+    ]
+    return (
+        select(*keys, func.sum(sub.c.quantity).label("quantity"))
+        .group_by(*keys)
+        .order_by(sub.c.ingredient_name, sub.c.ingredient_id, sub.c.unit)
+    )
+
+
+def _fold_items(rows: Iterable, per_week: bool = False) -> Iterable[GroceryItem]:
+    # Rows arrive ordered by ingredient then unit, so each item is complete
+    # as soon as the key changes.
+    item_cls = GroceryRangeItem if per_week else GroceryItem
+    current = None
+    recipes: set[str] = set()
+    for row in rows:
+        key = (row.ingredient_id, row.unit)
+        if current is None or (current.ingredient_id, current.unit) != key:
+            if current is not None:
+                current.recipes = sorted(recipes)
+                yield current
+            fields = {"weekly_quantities": {}} if per_week else {}
+            current = item_cls(
+                ingredient_id=row.ingredient_id,
+                ingredient_name=row.ingredient_name,
+                category=row.category,
+                total_quantity=0.0,
+                unit=row.unit,
+                recipes=[],
+                **fields,
+            )
+            recipes = set()
+        current.total_quantity += row.quantity
+        if per_week:
+            weekly = current.weekly_quantities
+            weekly[row.week_start] = weekly.get(row.week_start, 0.0) + row.quantity
+        recipes.add(row.recipe_name)
+    if current is not None:
+        current.recipes = sorted(recipes)
+        yield current
+
+
+def _group_by_category(items: Iterable[GroceryItem]) -> dict[str, list[GroceryItem]]:
     categories: dict[str, list[GroceryItem]] = defaultdict(list)
-    for data in sorted(aggregated.values(), key=lambda d: d["ingredient_name"]):
-        item = GroceryItem(
-            ingredient_id=data["ingredient_id"],
-            ingredient_name=data["ingredient_name"],
-            category=data["category"],
-            total_quantity=data["total_quantity"],
-            unit=data["unit"],
-            recipes=sorted(data["recipes"]),
-        )
-        categories[data["category"]].append(item)
+    for item in items:
+        categories[item.category].append(item)
+    return dict(categories)
 
+
+def generate_grocery_list(db: Session, week_plan: WeekPlan) -> GroceryList:
+    rows = db.execute(_summarize(_rollup_lines(week_plan.id)))
     return GroceryList(
         week_plan_id=week_plan.id,
-        categories=dict(categories),
+        categories=_group_by_category(_fold_items(rows)),
+    )
+
+
+def generate_range_grocery_list(db: Session, start: date, end: date) -> GroceryRangeList:
+    # Aggregation happens in SQL, so the rows streamed back are bounded by
+    # distinct (ingredient, unit, recipe, week) combinations rather than by
+    # the number of slots in the window.
+    lines = _slot_lines().where(MealSlot.date >= start, MealSlot.date <= end)
+    query = _summarize(lines, "week_start").execution_options(
+        yield_per=RANGE_BATCH_SIZE
+    )
+    week_starts: set[date] = set()
+
+    def track_weeks(rows: Iterable) -> Iterable:
+        for row in rows:
+            week_starts.add(row.week_start)
+            yield row
+
+    categories = _group_by_category(
+        _fold_items(track_weeks(db.execute(query)), per_week=True)
+    )
+    return GroceryRangeList(
+        start=start,
+        end=end,
+        week_starts=sorted(week_starts),
+        categories=categories,
     )
@@ -0,0 +1,134 @@
+import argparse
+import sys
+from collections.abc import Iterable
+
+from sqlalchemy import Select, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.grocery import GroceryRollup
+from app.models.meal_plan import MealSlot
+from app.models.recipe import RecipeIngredient
+
+ROLLUP_COLUMNS = ["week_plan_id", "recipe_id", "ingredient_id", "unit", "quantity"]
+
+
+def _source_query(
+    week_plan_ids: Iterable[int] | None = None,
+    recipe_ids: Iterable[int] | None = None,
+) -> Select:
+    q = (
+        select(
+            MealSlot.week_plan_id,
+            MealSlot.recipe_id,
+            RecipeIngredient.ingredient_id,
+            RecipeIngredient.unit,
+            func.sum(RecipeIngredient.quantity),
+        )
+        .join(RecipeIngredient, RecipeIngredient.recipe_id == MealSlot.recipe_id)
+        .where(MealSlot.is_leftover == False)  # noqa: E712
+        .group_by(
+            MealSlot.week_plan_id,
+            MealSlot.recipe_id,
+            RecipeIngredient.ingredient_id,
+            RecipeIngredient.unit,
+        )
+    )
+    if week_plan_ids is not None:
+        q = q.where(MealSlot.week_plan_id.in_(week_plan_ids))
+    if recipe_ids is not None:
+        q = q.where(MealSlot.recipe_id.in_(recipe_ids))
+    return q
+
+
+def refresh_rollup(
+    db: Session,
+    week_plan_ids: Iterable[int] | None = None,
+    recipe_ids: Iterable[int] | None = None,
+) -> None:
+    """Recompute the rollup rows for the given weeks and/or recipes.
+
+    Passing neither rebuilds the whole table. Runs inside the caller's
+    transaction; the caller commits.
+    """
+    if week_plan_ids is not None:
+        week_plan_ids = list(set(week_plan_ids))
+    if recipe_ids is not None:
+        recipe_ids = list(set(recipe_ids))
+    if week_plan_ids == [] or recipe_ids == []:
+        return
+
+    db.flush()
+    stmt = delete(GroceryRollup)
+    if week_plan_ids is not None:
+        stmt = stmt.where(GroceryRollup.week_plan_id.in_(week_plan_ids))
+    if recipe_ids is not None:
+        stmt = stmt.where(GroceryRollup.recipe_id.in_(recipe_ids))
+    db.execute(stmt)
+    db.execute(
+        insert(GroceryRollup).from_select(
+            ROLLUP_COLUMNS, _source_query(week_plan_ids, recipe_ids)
+        )
+    )
+
+
+def refresh_for_slots(
+    db: Session, keys: Iterable[tuple[int, int | None]]
+) -> None:
+    """Refresh the rollup for (week_plan_id, recipe_id) pairs touched by slot writes."""
+    keys = [(w, r) for w, r in keys if r is not None]
+    if not keys:
+        return
+    refresh_rollup(
+        db,
+        week_plan_ids=[w for w, _ in keys],
+        recipe_ids=[r for _, r in keys],
+    )
+
+
+def check_rollup(db: Session, tolerance: float = 1e-6) -> list[dict]:
+    """Compare the rollup with a fresh computation and return mismatched rows."""
+    expected = {
+        tuple(row[:4]): row[4] for row in db.execute(_source_query())
+    }
+    actual = {
+        (r.week_plan_id, r.recipe_id, r.ingredient_id, r.unit): r.quantity
+        for r in db.execute(select(GroceryRollup)).scalars()
+    }
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys(), key=str):
+        want, got = expected.get(key), actual.get(key)
+        if want is None or got is None or abs(want - got) > tolerance:
+            mismatches.append(
+                dict(zip(ROLLUP_COLUMNS[:4], key), expected=want, actual=got)
+            )
+    return mismatches
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.grocery_rollup",
+        description="Maintain the materialized grocery rollup table.",
+    )
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            refresh_rollup(db)
+            db.commit()
+            print("Grocery rollup rebuilt")
+            return 0
+        mismatches = check_rollup(db)
+        for m in mismatches:
+            print(m)
+        print(f"{len(mismatches)} mismatched rollup rows")
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import argparse
+import sys
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from math import ceil
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.ingredient import Ingredient
+from app.models.recipe import Recipe, RecipeIngredient
+from app.services.grocery_rollup import refresh_rollup
+from app.services.name_index import track_deletes, trigrams
+
+# Default minimum similarity for two names to be proposed as duplicates
+DEFAULT_THRESHOLD = 0.8
+
+
+@dataclass
+class DuplicateCluster:
+    target_id: int  # suggested survivor: the most used, then the oldest
+    ingredient_ids: list[int]  # target first, then by id
+
+
+@dataclass
+class MergeResult:
+    merged: int = 0  # source ingredients deleted
+    recipe_ids: set[int] = field(default_factory=set)
+
+
+def _singular(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("oes", "ches", "shes", "sses", "xes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def match_key(name_key: str) -> str:
+    """Name key with each word singularized, so plurals compare equal."""
+    return " ".join(_singular(word) for word in name_key.split(" "))
+
+
+def _similar_pairs(
+    keys: dict[int, str], threshold: float
+) -> Iterator[tuple[int, int]]:
+    # AllPairs-style prefix filtering: grams are ordered rarest first, and a
+    # pair with Dice >= threshold must share a gram within short prefixes
+    # of both sets. Only prefixes are indexed and probed, so common grams
+    # never produce quadratic candidate lists.
+    grams = {id_: trigrams(key) for id_, key in keys.items()}
+    freq = Counter(g for gs in grams.values() for g in gs)
+    # Ids are indexed in order of gram count, so each posting list is sorted
+    # by size and the size filter is a bisect.
+    postings: dict[str, tuple[list[int], list[int]]] = defaultdict(
+        lambda: ([], [])
+    )
+
+    for id_ in sorted(grams, key=lambda i: (len(grams[i]), i)):
+        own = grams[id_]
+        ordered = sorted(own, key=lambda g: (freq[g], g))
+        size = len(ordered)
+        min_overlap = ceil(threshold * size / (2 - threshold))
+        candidates: set[int] = set()
+        for g in ordered[: size - min_overlap + 1]:
+            entry = postings.get(g)
+            if entry is not None:
+                ids, sizes = entry
+                candidates.update(ids[bisect_left(sizes, min_overlap) :])
+        for other in candidates:
+            other_grams = grams[other]
+            shared = len(own & other_grams)
+            if 2 * shared >= threshold * (size + len(other_grams)):
+                yield other, id_
+        for g in ordered[: size - ceil(threshold * size) + 1]:
+            ids, sizes = postings[g]
+            ids.append(id_)
+            sizes.append(size)
+
+
+def find_duplicate_clusters(
+    db: Session, threshold: float = DEFAULT_THRESHOLD
+) -> list[DuplicateCluster]:
+    """Group ingredients whose singularized names are at least ``threshold`` similar.
+
+    Similarity is the Dice coefficient over name trigrams; clusters are the
+    connected components of similar pairs.
+    """
+    keys = {
+        id_: match_key(key)
+        for id_, key in db.execute(select(Ingredient.id, Ingredient.name_key))
+    }
+
+    parent = {id_: id_ for id_ in keys}
+
+    def root(id_: int) -> int:
+        while parent[id_] != id_:
+            parent[id_] = parent[parent[id_]]
+            id_ = parent[id_]
+        return id_
+
+    for a, b in _similar_pairs(keys, threshold):
+        ra, rb = root(a), root(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for id_ in keys:
+        groups[root(id_)].append(id_)
+    groups = {r: ids for r, ids in groups.items() if len(ids) > 1}
+    if not groups:
+        return []
+
+    uses = dict(
+        db.execute(
+            select(RecipeIngredient.ingredient_id, func.count())
+            .group_by(RecipeIngredient.ingredient_id)
+        ).all()
+    )
+    clusters = []
+    for ids in groups.values():
+        ids.sort(key=lambda i: (-uses.get(i, 0), i))
+        target, rest = ids[0], sorted(ids[1:])
+        clusters.append(DuplicateCluster(target, [target, *rest]))
+    clusters.sort(key=lambda c: keys[c.target_id])
+    return clusters
+
+
+def merge_ingredients(db: Session, merges: list[tuple[int, list[int]]]) -> MergeResult:
+    """Fold each (target_id, source_ids) cluster into its target.
+
+    Every cluster costs one UPDATE of recipe_ingredients and one DELETE of
+    the source ingredients. A recipe that used both a source and its target
+    then lists the target twice; rows in the same unit are folded into the
+    first, summing quantities, while rows in other units stay separate
+    lines. Affected recipes get a new ``updated_at``, so
+    cached responses built from the old names go stale, and their grocery
+    rollup rows are refreshed. Runs inside the caller's transaction; the
+    caller commits.
+    """
+    result = MergeResult()
+    for target_id, source_ids in merges:
+        if not source_ids:
+            continue
+        result.recipe_ids.update(
+            db.scalars(
+                update(RecipeIngredient)
+                .where(RecipeIngredient.ingredient_id.in_(source_ids))
+                .values(ingredient_id=target_id)
+                .returning(RecipeIngredient.recipe_id)
+            )
+        )
+        db.execute(delete(Ingredient).where(Ingredient.id.in_(source_ids)))
+        track_deletes(db, Ingredient, source_ids)
+        result.merged += len(source_ids)
+    if result.recipe_ids:
+        _fold_repeated_rows(
+            db, result.recipe_ids, [target_id for target_id, _ in merges]
+        )
+        db.execute(
+            update(Recipe)
+            .where(Recipe.id.in_(result.recipe_ids))
+            .values(updated_at=func.now())
+        )
+        refresh_rollup(db, recipe_ids=result.recipe_ids)
+    return result
+
+
+def _fold_repeated_rows(
+    db: Session, recipe_ids: set[int], ingredient_ids: list[int]
+) -> None:
+    rows = db.execute(
+        select(
+            RecipeIngredient.id,
+            RecipeIngredient.recipe_id,
+            RecipeIngredient.ingredient_id,
+            RecipeIngredient.unit,
+            RecipeIngredient.quantity,
+        )
+        .where(
+            RecipeIngredient.recipe_id.in_(recipe_ids),
+            RecipeIngredient.ingredient_id.in_(ingredient_ids),
+        )
+        .order_by(RecipeIngredient.position, RecipeIngredient.id)
+    )
+    # First row of each (recipe, ingredient, unit), and the ids folded into it
+    kept: dict[tuple[int, int, str], dict] = {}
+    folded: dict[tuple[int, int, str], list[int]] = defaultdict(list)
+    for row in rows:
+        key = (row.recipe_id, row.ingredient_id, row.unit)
+        if key in kept:
+            kept[key]["quantity"] += row.quantity
+            folded[key].append(row.id)
+        else:
+            kept[key] = {"id": row.id, "quantity": row.quantity}
+    if not folded:
+        return
+    db.execute(update(RecipeIngredient), [kept[key] for key in folded])
+    db.execute(
+        delete(RecipeIngredient).where(
+            RecipeIngredient.id.in_([id_ for ids in folded.values() for id_ in ids])
+        )
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.ingredient_dedupe",
+        description="Find and merge near-duplicate ingredients.",
+    )
+    parser.add_argument("command", choices=["find", "merge"])
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        clusters = find_duplicate_clusters(db, args.threshold)
+        names = dict(
+            db.execute(
+                select(Ingredient.id, Ingredient.name).where(
+                    Ingredient.id.in_(
+                        [i for c in clusters for i in c.ingredient_ids]
+                    )
+                )
+            ).all()
+        )
+        for c in clusters:
+            print(" <- ".join(f"{names[i]} ({i})" for i in c.ingredient_ids))
+        print(f"{len(clusters)} duplicate clusters")
+        if args.command == "merge" and clusters:
+            result = merge_ingredients(
+                db, [(c.target_id, c.ingredient_ids[1:]) for c in clusters]
+            )
+            db.commit()
+            print(
+                f"Merged {result.merged} ingredients "
+                f"across {len(result.recipe_ids)} recipes"
+            )
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
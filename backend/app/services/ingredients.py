@@ -0,0 +1,72 @@
+from collections.abc import Sequence
+
+from sqlalchemy import insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.ingredient import Ingredient
+from app.models.names import normalize_name
+from app.services.name_index import ingredient_names, track_inserts
+
+
+def resolve_ingredients(
+    db: Session,
+    specs: Sequence[tuple[str, str, str]],
+    match_threshold: float | None = None,
+) -> list[Ingredient]:
+    """Find or create ingredients for (name, category, default_unit) specs.
+
+    Names match on their normalized key. With ``match_threshold``, names
+    without an exact match fall back to the closest trigram match at or
+    above that similarity. Either way the whole list costs one SELECT plus
+    at most one multi-row INSERT. Results are returned in the order of
+    ``specs``; repeated names share a row and the first spec for a new name
+    decides its category and unit.
+    """
+    keys = [normalize_name(name) for name, _, _ in specs]
+    # Near-miss candidates come from the in-memory index, so they ride along
+    # in the same SELECT as the exact keys.
+    near: dict[str, int] = {}
+    if match_threshold is not None:
+        for key in set(keys):
+            match = ingredient_names.best_match(db, key, match_threshold)
+            if match:
+                near[key] = match[0]
+
+    found: dict[str, Ingredient] = {}
+    if keys:
+        by_id: dict[int, Ingredient] = {}
+        for ingredient in db.scalars(
+            select(Ingredient)
+            .where(
+                or_(
+                    Ingredient.name_key.in_(set(keys)),
+                    Ingredient.id.in_(set(near.values())),
+                )
+            )
+            .order_by(Ingredient.id)
+        ):
+            found.setdefault(ingredient.name_key, ingredient)
+            by_id[ingredient.id] = ingredient
+        for key, ingredient_id in near.items():
+            if key not in found and ingredient_id in by_id:
+                found[key] = by_id[ingredient_id]
+
+    missing: dict[str, dict] = {}
+    for key, (name, category, unit) in zip(keys, specs):
+        if key not in found and key not in missing:
+            missing[key] = {
+                "name": name.strip(),
+                "category": category,
+                "default_unit": unit,
+            }
+    if missing:
+        # Keys are unique within the INSERT, so rows are matched up by key
+        # rather than by position; ordered RETURNING would make SQLite
+        # execute one statement per row.
+        created = db.scalars(
+            insert(Ingredient).returning(Ingredient), list(missing.values())
+        )
+        found.update((ingredient.name_key, ingredient) for ingredient in created)
+        track_inserts(db, Ingredient, ((found[k].id, k) for k in missing))
+
+    return [found[key] for key in keys]
@@ -0,0 +1,177 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import astuple, dataclass
+from datetime import date, timedelta
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.meal_plan import MealSlot, WeekPlan, WeekTemplate
+from app.services.grocery_rollup import refresh_rollup
+
+
+def week_start_for(day: date) -> date:
+    """The Saturday that starts the (Sat-Fri) week containing ``day``."""
+    return day - timedelta(days=(day.weekday() - 5) % 7)
+
+
+def get_or_create_week_plans(
+    db: Session, week_starts: Iterable[date]
+) -> dict[date, WeekPlan]:
+    """Return the week plans for ``week_starts``, creating any that are missing.
+
+    Costs one SELECT plus one multi-row INSERT for the new rows.
+    """
+    wanted = set(week_starts)
+    if not wanted:
+        return {}
+    plans = {
+        plan.week_start: plan
+        for plan in db.scalars(
+            select(WeekPlan).where(WeekPlan.week_start.in_(wanted))
+        )
+    }
+    missing = sorted(wanted - plans.keys())
+    if missing:
+        # Unordered RETURNING: ordered RETURNING runs one INSERT per row on
+        # SQLite, and week_start identifies each new row anyway.
+        db.flush()
+        created = db.scalars(
+            insert(WeekPlan).returning(WeekPlan),
+            [{"week_start": ws} for ws in missing],
+        )
+        plans.update((plan.week_start, plan) for plan in created)
+    return plans
+
+
+@dataclass(frozen=True)
+class SlotSpec:
+    """A slot to stamp onto a week, positioned relative to its Saturday."""
+
+    day_offset: int
+    meal_type: str
+    recipe_id: int | None
+    is_leftover: bool
+    notes: str | None
+    sort_order: int
+    # Index into the same spec list of the slot this one is leftovers of
+    leftover_of: int | None = None
+
+    def content(self) -> tuple:
+        return astuple(self)[:-1]
+
+
+def _specs(slots, day_offset) -> list[SlotSpec]:
+    position = {slot.id: i for i, slot in enumerate(slots)}
+    return [
+        SlotSpec(
+            day_offset=day_offset(slot),
+            meal_type=slot.meal_type,
+            recipe_id=slot.recipe_id,
+            is_leftover=slot.is_leftover,
+            notes=slot.notes,
+            sort_order=slot.sort_order,
+            # Links to slots outside the copied week are dropped
+            leftover_of=position.get(slot.leftover_source_id),
+        )
+        for slot in slots
+    ]
+
+
+def plan_slot_specs(plan: WeekPlan) -> list[SlotSpec]:
+    return _specs(plan.slots, lambda slot: (slot.date - plan.week_start).days)
+
+
+def template_slot_specs(template: WeekTemplate) -> list[SlotSpec]:
+    return _specs(template.slots, lambda slot: slot.day_offset)
+
+
+def stamp_week(
+    db: Session,
+    specs: list[SlotSpec],
+    week_starts: Iterable[date],
+    replace: bool = False,
+) -> tuple[list[WeekPlan], int]:
+    """Copy ``specs`` into the week plan of every Saturday in ``week_starts``.
+
+    Missing plans are created. Each target costs one multi-row INSERT, plus
+    one UPDATE to link leftovers when the specs have any. With ``replace``
+    the targets' existing slots are deleted first. Returns the target plans,
+    in order, and the number of slots created. Runs inside the caller's
+    transaction; the caller commits.
+    """
+    week_starts = list(dict.fromkeys(week_starts))
+    plans = get_or_create_week_plans(db, week_starts)
+    targets = [plans[ws] for ws in week_starts]
+    target_ids = [plan.id for plan in targets]
+    if replace:
+        db.execute(delete(MealSlot).where(MealSlot.week_plan_id.in_(target_ids)))
+
+    slots = MealSlot.__table__
+    created = 0
+    for plan in targets if specs else ():
+        # Table-level insert, as the ORM splits rows with differing None
+        # columns into separate statements
+        new_slots = db.execute(
+            insert(slots).returning(
+                slots.c.id,
+                slots.c.date,
+                slots.c.meal_type,
+                slots.c.recipe_id,
+                slots.c.is_leftover,
+                slots.c.notes,
+                slots.c.sort_order,
+            ),
+            [
+                {
+                    "week_plan_id": plan.id,
+                    "date": plan.week_start + timedelta(days=spec.day_offset),
+                    "meal_type": spec.meal_type,
+                    "recipe_id": spec.recipe_id,
+                    "is_leftover": spec.is_leftover,
+                    "notes": spec.notes,
+                    "sort_order": spec.sort_order,
+                }
+                for spec in specs
+            ],
+        ).all()
+        created += len(new_slots)
+        if any(spec.leftover_of is not None for spec in specs):
+            _link_leftovers(db, plan, specs, new_slots)
+
+    # The bulk writes bypassed the ORM, so reload slot collections on access
+    for plan in targets:
+        db.expire(plan, ["slots"])
+    refresh_rollup(db, week_plan_ids=target_ids)
+    return targets, created
+
+
+def _link_leftovers(
+    db: Session, plan: WeekPlan, specs: list[SlotSpec], new_slots: list
+) -> None:
+    # Unordered RETURNING keeps the INSERT a single statement on SQLite, so
+    # new rows are matched back to their specs by content. Specs with equal
+    # content produce identical rows, so any pairing among them is correct.
+    by_content = defaultdict(list)
+    for row in new_slots:
+        spec_content = (
+            (row.date - plan.week_start).days,
+            row.meal_type,
+            row.recipe_id,
+            row.is_leftover,
+            row.notes,
+            row.sort_order,
+        )
+        by_content[spec_content].append(row.id)
+    new_ids = [by_content[spec.content()].pop() for spec in specs]
+    slots = MealSlot.__table__
+    db.execute(
+        update(slots)
+        .where(slots.c.id == bindparam("slot_id"))
+        .values(leftover_source_id=bindparam("source_id")),
+        [
+            {"slot_id": new_ids[i], "source_id": new_ids[spec.leftover_of]}
+            for i, spec in enumerate(specs)
+            if spec.leftover_of is not None
+        ],
+    )
@@ -0,0 +1,362 @@
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.models.ingredient import Ingredient
+from app.models.names import NameKeyGeneration, normalize_name
+from app.models.recipe import Recipe
+
+# Pending index changes recorded on a session between flush and commit
+_PENDING_KEY = "name_index_pending"
+# (before, after) name key generation of each table the session changed
+_GENERATIONS_KEY = "name_index_generations"
+# The two above as each open savepoint began, restored if it rolls back
+_SAVEPOINTS_KEY = "name_index_savepoints"
+
+
+def trigrams(key: str) -> frozenset[str]:
+    # Padded like pg_trgm so short names and word starts still carry weight
+    padded = f"  {key} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class NameIndex(ABC):
+    """Base for in-memory indexes over a model's ``name_key`` column.
+
+    Built lazily from the database on first use, then kept current from ORM
+    flushes and ``track_inserts`` calls once their transaction commits.
+    Every lookup first reads the table's name key generation, one primary
+    key lookup, and reloads if another process or worker changed the names
+    since. Subclasses implement ``_empty``, ``_add`` and ``_discard`` over
+    their own state object, and may override ``_build`` for a faster full
+    load than one ``_add`` per row.
+
+    The lock only guards the in-memory state: it is never held across a
+    query, so a slow load can't stall lookups in other threads, or deadlock
+    one that is driving an async session from the event loop.
+    """
+
+    def __init__(self, model) -> None:
+        self.model = model
+        self._lock = threading.Lock()
+        self._state = self._empty()
+        self._loaded = False
+        self._generation: int | None = None
+
+    @abstractmethod
+    def _empty(self): ...
+
+    @abstractmethod
+    def _add(self, state, id_: int, key: str) -> None: ...
+
+    @abstractmethod
+    def _discard(self, state, id_: int) -> None: ...
+
+    def _build(self, state, rows: Iterable[tuple[int, str]]) -> None:
+        """Fill an empty ``state`` from every (id, name_key) row."""
+        for id_, key in rows:
+            self._add(state, id_, key)
+
+    def _ensure_loaded(self, db: Session) -> None:
+        generation = current_generation(db, self.model)
+        with self._lock:
+            if self._loaded and self._generation == generation:
+                return
+        # Build a fresh state outside the lock, then swap it in. If another
+        # thread loaded meanwhile, the last swap wins; a state older than its
+        # rows' generation just reloads on the next lookup.
+        state = self._empty()
+        self._build(state, db.execute(select(self.model.id, self.model.name_key)))
+        with self._lock:
+            self._state = state
+            self._loaded = True
+            self._generation = generation
+
+    def apply(
+        self,
+        upserts: dict[int, str],
+        deletes: set[int],
+        generations: tuple[int, int],
+    ) -> None:
+        """Apply a committed transaction's changes.
+
+        ``generations`` is the table's generation before and after that
+        transaction. If the index wasn't at the first, it has missed another
+        writer's changes and is left to reload on its next lookup.
+        """
+        before, after = generations
+        with self._lock:
+            if not self._loaded or self._generation != before:
+                return
+            for id_, key in upserts.items():
+                self._discard(self._state, id_)
+                self._add(self._state, id_, key)
+            for id_ in deletes:
+                self._discard(self._state, id_)
+            self._generation = after
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded = False
+
+
+@dataclass
+class _TrigramState:
+    grams: dict[int, frozenset[str]] = field(default_factory=dict)
+    postings: dict[str, set[int]] = field(default_factory=lambda: defaultdict(set))
+
+
+class TrigramIndex(NameIndex):
+    """Closest-name lookup by trigram similarity."""
+
+    def _empty(self) -> _TrigramState:
+        return _TrigramState()
+
+    def _add(self, state: _TrigramState, id_: int, key: str) -> None:
+        grams = trigrams(key)
+        state.grams[id_] = grams
+        for gram in grams:
+            state.postings[gram].add(id_)
+
+    def _discard(self, state: _TrigramState, id_: int) -> None:
+        for gram in state.grams.pop(id_, ()):
+            state.postings[gram].discard(id_)
+
+    def matches(
+        self, db: Session, name: str, threshold: float
+    ) -> list[tuple[int, float]]:
+        """Return (id, score) of every name scoring at least ``threshold``.
+
+        Scores are the Dice coefficient of the two trigram sets, from 0 to 1.
+        Best matches come first; ties go to the lowest id, i.e. the oldest
+        row.
+        """
+        query = trigrams(normalize_name(name))
+        self._ensure_loaded(db)
+        with self._lock:
+            state = self._state
+            overlap: dict[int, int] = defaultdict(int)
+            for gram in query:
+                for id_ in state.postings.get(gram, ()):
+                    overlap[id_] += 1
+            found = []
+            for id_, shared in overlap.items():
+                score = 2 * shared / (len(query) + len(state.grams[id_]))
+                if score >= threshold:
+                    found.append((id_, score))
+        found.sort(key=lambda match: (-match[1], match[0]))
+        return found
+
+    def best_match(
+        self, db: Session, name: str, threshold: float
+    ) -> tuple[int, float] | None:
+        """Return (id, score) of the closest name, or None below ``threshold``."""
+        found = self.matches(db, name, threshold)
+        return found[0] if found else None
+
+
+@dataclass
+class _PrefixState:
+    names: list[tuple[str, int]] = field(default_factory=list)
+    tails: list[tuple[str, int]] = field(default_factory=list)
+    keys: dict[int, str] = field(default_factory=dict)
+
+
+class PrefixIndex(NameIndex):
+    """Prefix lookup over sorted name keys, for autocomplete.
+
+    Whole names and the tails starting at each later word are kept in two
+    sorted lists, so a prefix is two binary searches and the results come
+    back already ranked: names starting with the prefix, then names with a
+    later word starting with it, each alphabetically.
+    """
+
+    def _empty(self) -> _PrefixState:
+        return _PrefixState()
+
+    @staticmethod
+    def _tails_of(key: str) -> list[str]:
+        words = key.split(" ")
+        return [" ".join(words[i:]) for i in range(1, len(words))]
+
+    def _add(self, state: _PrefixState, id_: int, key: str) -> None:
+        state.keys[id_] = key
+        insort(state.names, (key, id_))
+        for tail in self._tails_of(key):
+            insort(state.tails, (tail, id_))
+
+    def _build(self, state: _PrefixState, rows: Iterable[tuple[int, str]]) -> None:
+        # Sort once at the end: inserting each row in order is quadratic
+        for id_, key in rows:
+            state.keys[id_] = key
+            state.names.append((key, id_))
+            state.tails.extend((tail, id_) for tail in self._tails_of(key))
+        state.names.sort()
+        state.tails.sort()
+
+    def _discard(self, state: _PrefixState, id_: int) -> None:
+        key = state.keys.pop(id_, None)
+        if key is None:
+            return
+        _remove_sorted(state.names, (key, id_))
+        for tail in self._tails_of(key):
+            _remove_sorted(state.tails, (tail, id_))
+
+    def search(self, db: Session, prefix: str, limit: int) -> list[int]:
+        """Return up to ``limit`` ids of names with a word starting with ``prefix``."""
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+        ids: dict[int, None] = {}
+        self._ensure_loaded(db)
+        with self._lock:
+            for entries in (self._state.names, self._state.tails):
+                i = bisect_left(entries, (prefix,))
+                while (
+                    len(ids) < limit
+                    and i < len(entries)
+                    and entries[i][0].startswith(prefix)
+                ):
+                    ids.setdefault(entries[i][1])
+                    i += 1
+        return list(ids)
+
+
+def _remove_sorted(entries: list, entry: tuple) -> None:
+    i = bisect_left(entries, entry)
+    if i < len(entries) and entries[i] == entry:
+        del entries[i]
+
+
+recipe_names = TrigramIndex(Recipe)
+ingredient_names = TrigramIndex(Ingredient)
+ingredient_prefixes = PrefixIndex(Ingredient)
+
+_INDEXES = {
+    Recipe: [recipe_names],
+    Ingredient: [ingredient_names, ingredient_prefixes],
+}
+
+
+def current_generation(db: Session, model) -> int | None:
+    """The committed name key generation of ``model``'s table."""
+    return db.scalar(
+        select(NameKeyGeneration.generation).where(
+            NameKeyGeneration.table_name == model.__tablename__
+        )
+    )
+
+
+def _bump_generation(db: Session, model) -> None:
+    # Row-locks the generation until commit, so concurrent writers to the
+    # same table's names take turns and each sees the other's bump
+    after = db.connection().scalar(
+        update(NameKeyGeneration.__table__)
+        .where(NameKeyGeneration.table_name == model.__tablename__)
+        .values(generation=NameKeyGeneration.generation + 1)
+        .returning(NameKeyGeneration.generation)
+    )
+    if after is None:
+        return
+    generations = db.info.setdefault(_GENERATIONS_KEY, {})
+    before = generations.get(model, (after - 1, after))[0]
+    generations[model] = (before, after)
+
+
+def _pending(db: Session, model) -> list[tuple[dict[int, str], set[int]]]:
+    pending = db.info.setdefault(_PENDING_KEY, {})
+    return [
+        pending.setdefault(index, ({}, set())) for index in _INDEXES.get(model, ())
+    ]
+
+
+def track_inserts(db: Session, model, rows: Iterable[tuple[int, str]]) -> None:
+    """Index (id, name_key) rows written with Core once ``db`` commits."""
+    rows = list(rows)
+    if not rows:
+        return
+    for upserts, _ in _pending(db, model):
+        upserts.update(rows)
+    _bump_generation(db, model)
+
+
+def track_deletes(db: Session, model, ids: Iterable[int]) -> None:
+    """Drop ids deleted with Core from the indexes once ``db`` commits."""
+    ids = list(ids)
+    if not ids:
+        return
+    for upserts, deletes in _pending(db, model):
+        for id_ in ids:
+            upserts.pop(id_, None)
+        deletes.update(ids)
+    _bump_generation(db, model)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changes(db: Session, flush_context) -> None:
+    changed = set()
+    for obj in db.new:
+        for upserts, deletes in _pending(db, type(obj)):
+            upserts[obj.id] = obj.name_key
+            deletes.discard(obj.id)
+            changed.add(type(obj))
+    for obj in db.dirty:
+        if type(obj) not in _INDEXES:
+            continue
+        if not inspect(obj).attrs.name_key.history.has_changes():
+            continue
+        for upserts, deletes in _pending(db, type(obj)):
+            upserts[obj.id] = obj.name_key
+            deletes.discard(obj.id)
+            changed.add(type(obj))
+    for obj in db.deleted:
+        for upserts, deletes in _pending(db, type(obj)):
+            upserts.pop(obj.id, None)
+            deletes.add(obj.id)
+            changed.add(type(obj))
+    for model in changed:
+        _bump_generation(db, model)
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _snapshot_changes(db: Session, transaction) -> None:
+    if not transaction.nested:
+        return
+    pending = {
+        index: (dict(upserts), set(deletes))
+        for index, (upserts, deletes) in db.info.get(_PENDING_KEY, {}).items()
+    }
+    generations = dict(db.info.get(_GENERATIONS_KEY, {}))
+    db.info.setdefault(_SAVEPOINTS_KEY, {})[transaction] = (pending, generations)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(db: Session) -> None:
+    if db.in_nested_transaction():
+        # A savepoint was released; its changes wait for the outer commit
+        return
+    db.info.pop(_SAVEPOINTS_KEY, None)
+    generations = db.info.pop(_GENERATIONS_KEY, {})
+    for index, (upserts, deletes) in db.info.pop(_PENDING_KEY, {}).items():
+        if index.model in generations:
+            index.apply(upserts, deletes, generations[index.model])
+
+
+# Not after_rollback: that also fires when a savepoint rolls back, which
+# must only undo the changes recorded since the savepoint began
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(db: Session, previous_transaction) -> None:
+    if previous_transaction.nested:
+        snapshot = db.info.get(_SAVEPOINTS_KEY, {}).pop(previous_transaction, None)
+        if snapshot is not None:
+            db.info[_PENDING_KEY], db.info[_GENERATIONS_KEY] = snapshot
+        return
+    db.info.pop(_SAVEPOINTS_KEY, None)
+    db.info.pop(_PENDING_KEY, None)
+    db.info.pop(_GENERATIONS_KEY, None)
@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from app.config import settings
+
+
+class RecipeCache:
+    """In-process LRU of serialized RecipeRead responses.
+
+    Entries are keyed by recipe id and tagged with the ``updated_at`` they
+    were built from, so a row that changed underneath is never served. Write
+    paths also invalidate explicitly, since some edits (ingredient renames,
+    several saves within one second) leave ``updated_at`` unchanged.
+
+    Invalidation bumps the recipe's generation. Readers take ``generation()``
+    before loading a recipe and pass it to ``put``, which drops bodies built
+    from a row that was invalidated in the meantime.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[int, tuple[datetime, bytes]] = OrderedDict()
+        self._generations: dict[int, int] = {}
+        self._epoch = 0  # bumped by clear()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, recipe_id: int, updated_at: datetime) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(recipe_id)
+            if entry is None or entry[0] != updated_at:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(recipe_id)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, recipe_id: int) -> tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generations.get(recipe_id, 0)
+
+    def put(
+        self,
+        recipe_id: int,
+        updated_at: datetime,
+        body: bytes,
+        generation: tuple[int, int],
+    ) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if generation != (self._epoch, self._generations.get(recipe_id, 0)):
+                return
+            self._entries[recipe_id] = (updated_at, body)
+            self._entries.move_to_end(recipe_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *recipe_ids: int) -> None:
+        with self._lock:
+            for recipe_id in recipe_ids:
+                self._generations[recipe_id] = self._generations.get(recipe_id, 0) + 1
+                if self._entries.pop(recipe_id, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+recipe_cache = RecipeCache(settings.recipe_cache_size)
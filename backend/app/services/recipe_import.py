@@ -0,0 +1,150 @@
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.names import normalize_name
+from app.models.recipe import Recipe, RecipeIngredient, RecipeTag, normalize_tags
+from app.schemas.recipe import RecipeImport, RecipeImportError
+from app.services.ingredients import resolve_ingredients
+from app.services.name_index import track_inserts
+
+# Records written per transaction
+IMPORT_BATCH_SIZE = 1000
+
+
+async def iter_ndjson(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, RecipeImport | RecipeImportError]]:
+    """Parse an NDJSON byte stream into (line number, record or error) pairs.
+
+    Only the current line is buffered, so request bodies of any size are
+    parsed incrementally. Blank lines are skipped.
+    """
+    buffer = b""
+    line_no = 0
+
+    def parse(raw: bytes) -> RecipeImport | RecipeImportError:
+        try:
+            record = RecipeImport.model_validate_json(raw)
+        except ValidationError as e:
+            return RecipeImportError(line=line_no, error=_format_error(e))
+        if not record.name.strip():
+            return RecipeImportError(line=line_no, error="name: must not be blank")
+        for ing in record.ingredients:
+            if not ing.name.strip():
+                return RecipeImportError(
+                    line=line_no, error="ingredients: name must not be blank"
+                )
+        return record
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for raw in lines:
+            line_no += 1
+            if raw.strip():
+                yield line_no, parse(raw)
+    if buffer.strip():
+        line_no += 1
+        yield line_no, parse(buffer)
+
+
+def _format_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'record'}: {err['msg']}"
+        for err in e.errors()
+    )
+
+
+def _insert_records(db: Session, records: list[RecipeImport]) -> None:
+    # Set-based writes: one ingredient resolution, then one multi-row INSERT
+    # each for recipes, tags and recipe ingredients.
+    specs = [
+        (ing.name, ing.category, ing.unit)
+        for record in records
+        for ing in record.ingredients
+    ]
+    ingredients = iter(resolve_ingredients(db, specs))
+
+    # Unordered RETURNING keeps this a single INSERT on SQLite, so rows are
+    # matched back to records by name key. A multi-row INSERT assigns ids in
+    # row order, so records sharing a name take their ids in ascending order.
+    inserted = db.execute(
+        insert(Recipe).returning(Recipe.id, Recipe.name_key),
+        [
+            {
+                "name": r.name,
+                "description": r.description,
+                "servings": r.servings,
+                "prep_time_min": r.prep_time_min,
+                "cook_time_min": r.cook_time_min,
+                "instructions": r.instructions,
+            }
+            for r in records
+        ],
+    )
+    ids_by_key: dict[str, deque[int]] = defaultdict(deque)
+    for recipe_id, key in sorted(inserted):
+        ids_by_key[key].append(recipe_id)
+    recipe_ids = [ids_by_key[normalize_name(r.name)].popleft() for r in records]
+
+    tag_rows = []
+    ingredient_rows = []
+    for recipe_id, record in zip(recipe_ids, records):
+        tag_rows.extend(
+            {"recipe_id": recipe_id, "tag": tag, "position": position}
+            for position, tag in enumerate(normalize_tags(record.tags))
+        )
+        ingredient_rows.extend(
+            {
+                "recipe_id": recipe_id,
+                "ingredient_id": next(ingredients).id,
+                "quantity": ing.quantity,
+                "unit": ing.unit,
+                "preparation": ing.preparation,
+                "optional": ing.optional,
+                "position": position,
+            }
+            for position, ing in enumerate(record.ingredients)
+        )
+    if tag_rows:
+        db.execute(insert(RecipeTag), tag_rows)
+    if ingredient_rows:
+        db.execute(insert(RecipeIngredient), ingredient_rows)
+    track_inserts(
+        db,
+        Recipe,
+        ((id_, normalize_name(r.name)) for id_, r in zip(recipe_ids, records)),
+    )
+
+
+def import_batch(
+    db: Session, batch: list[tuple[int, RecipeImport]]
+) -> list[RecipeImportError]:
+    """Write a batch of parsed records in one transaction.
+
+    If the batch fails as a whole, each record is retried in its own
+    savepoint so one bad record only costs itself.
+    """
+    try:
+        _insert_records(db, [record for _, record in batch])
+        db.commit()
+        return []
+    except SQLAlchemyError:
+        db.rollback()
+
+    errors = []
+    for line_no, record in batch:
+        try:
+            with db.begin_nested():
+                _insert_records(db, [record])
+        except SQLAlchemyError as e:
+            errors.append(
+                RecipeImportError(line=line_no, error=str(getattr(e, "orig", e)))
+            )
+    db.commit()
+    return errors
@@ -0,0 +1,117 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.ingredient import Ingredient
+from app.models.recipe import Recipe, RecipeIngredient
+
+# Fields compared when deciding whether an existing row has changed
+ROW_FIELDS = ("quantity", "unit", "preparation", "optional")
+
+
+@dataclass
+class IngredientDiff:
+    added: list[int] = field(default_factory=list)
+    changed: list[int] = field(default_factory=list)
+    removed: list[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+def missing_ingredient_ids(db: Session, ids: Iterable[int]) -> list[int]:
+    """Return the ids in ``ids`` with no Ingredient row, using one IN query."""
+    wanted = set(ids)
+    if not wanted:
+        return []
+    found = set(db.scalars(select(Ingredient.id).where(Ingredient.id.in_(wanted))))
+    return sorted(wanted - found)
+
+
+def insert_recipe_ingredients(
+    db: Session, recipe_id: int, rows: Iterable[dict]
+) -> list[int]:
+    """Insert ingredient rows for a recipe in one statement; return their ids.
+
+    Rows are positioned in the order given unless they carry a ``position``.
+    Ids come back in no particular order: ordered RETURNING would make
+    SQLite execute one INSERT per row.
+    """
+    rows = [
+        {"recipe_id": recipe_id, "position": position, **row}
+        for position, row in enumerate(rows)
+    ]
+    if not rows:
+        return []
+    return sorted(
+        db.scalars(insert(RecipeIngredient).returning(RecipeIngredient.id), rows)
+    )
+
+
+def sync_recipe_ingredients(
+    db: Session, recipe: Recipe, desired: list[dict]
+) -> IngredientDiff:
+    """Make a recipe's ingredient rows match ``desired`` with minimal writes.
+
+    Each desired entry holds ``ingredient_id`` plus the ROW_FIELDS, and its
+    index in ``desired`` becomes the row's position. Rows that already match
+    are left alone, rows for the same ingredient are updated in place (a row
+    that only moved counts as changed), and only the remainder is inserted
+    or deleted. Bumps the recipe's ``updated_at`` when anything changed.
+    """
+    remaining = list(recipe.ingredients)
+    unmatched = []
+    diff = IngredientDiff()
+
+    # Exact matches first so unchanged rows cost nothing, or only a position
+    for position, entry in enumerate(desired):
+        values = tuple(entry.get(f) for f in ROW_FIELDS)
+        for ri in remaining:
+            if ri.ingredient_id == entry["ingredient_id"] and values == tuple(
+                getattr(ri, f) for f in ROW_FIELDS
+            ):
+                remaining.remove(ri)
+                if ri.position != position:
+                    ri.position = position
+                    diff.changed.append(ri.id)
+                break
+        else:
+            unmatched.append((position, entry))
+
+    added = []
+    for position, entry in unmatched:
+        reuse = next(
+            (ri for ri in remaining if ri.ingredient_id == entry["ingredient_id"]),
+            None,
+        )
+        if reuse is not None:
+            remaining.remove(reuse)
+            for f in ROW_FIELDS:
+                setattr(reuse, f, entry.get(f))
+            reuse.position = position
+            diff.changed.append(reuse.id)
+        else:
+            added.append(
+                {
+                    "ingredient_id": entry["ingredient_id"],
+                    "position": position,
+                    **{f: entry.get(f) for f in ROW_FIELDS},
+                }
+            )
+
+    for ri in remaining:
+        diff.removed.append(ri.id)
+        recipe.ingredients.remove(ri)
+
+    if added or diff.changed or diff.removed:
+        recipe.updated_at = func.now()
+        db.flush()
+    if added:
+        # New rows go in as one INSERT rather than one per row from the
+        # flush; the collection is reloaded on next access
+        diff.added = insert_recipe_ingredients(db, recipe.id, added)
+    if diff:
+        db.expire(recipe, ["ingredients"])
+    return diff
@@ -0,0 +1,87 @@
+import re
+
+from sqlalchemy import (
+    Float,
+    Integer,
+    Subquery,
+    and_,
+    case,
+    exists,
+    or_,
+    select,
+    text,
+)
+
+from app.database import engine
+from app.models.ingredient import Ingredient
+from app.models.recipe import Recipe, RecipeIngredient, RecipeTag
+
+# bm25 column weights: name, description, instructions, tags, ingredients
+BM25_WEIGHTS = (10.0, 2.0, 1.0, 4.0, 3.0)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_match_query(term: str) -> str | None:
+    """Turn free text into an FTS5 MATCH expression.
+
+    Every word must match, as a prefix, somewhere in the document. Words are
+    quoted so user input can never be parsed as FTS5 query syntax.
+    """
+    tokens = _TOKEN_RE.findall(term)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def recipe_search_subquery(term: str) -> Subquery | None:
+    """Ranked recipe ids matching ``term``; lower ``rank`` is a better match."""
+    if engine.dialect.name != "sqlite":
+        return _substring_search_subquery(term)
+    match = fts_match_query(term)
+    if match is None:
+        return None
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    return (
+        text(
+            f"SELECT rowid AS recipe_id, bm25(recipes_fts, {weights}) AS rank "
+            "FROM recipes_fts WHERE recipes_fts MATCH :match"
+        )
+        .bindparams(match=match)
+        .columns(recipe_id=Integer, rank=Float)
+        .subquery("recipe_search")
+    )
+
+
+def _substring_search_subquery(term: str) -> Subquery | None:
+    # Fallback for backends without the FTS5 index: every word must occur,
+    # case-insensitively, in one of the indexed fields. Each hit adds that
+    # field's BM25 weight, negated so lower still ranks first.
+    tokens = _TOKEN_RE.findall(term)
+    if not tokens:
+        return None
+    matches = []
+    rank = 0.0
+    for token in tokens:
+        fields = [
+            Recipe.name.icontains(token, autoescape=True),
+            Recipe.description.icontains(token, autoescape=True),
+            Recipe.instructions.icontains(token, autoescape=True),
+            exists().where(
+                RecipeTag.recipe_id == Recipe.id,
+                RecipeTag.tag.icontains(token, autoescape=True),
+            ),
+            exists().where(
+                RecipeIngredient.recipe_id == Recipe.id,
+                Ingredient.id == RecipeIngredient.ingredient_id,
+                Ingredient.name.icontains(token, autoescape=True),
+            ),
+        ]
+        matches.append(or_(*fields))
+        for field, weight in zip(fields, BM25_WEIGHTS):
+            rank = rank - case((field, weight), else_=0.0)
+    return (
+        select(Recipe.id.label("recipe_id"), rank.label("rank"))
+        .where(and_(*matches))
+        .subquery("recipe_search")
+    )
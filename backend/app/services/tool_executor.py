@@ -1,30 +1,68 @@
-import json
-from datetime import date, timedelta
+from datetime import date
 
-from sqlalchemy import func
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.ingredient import Ingredient
-from app.models.meal_plan import MealSlot, WeekPlan
-from app.models.recipe import Recipe, RecipeIngredient
-
-
-def find_or_create_ingredient(
-    db: Session, name: str, category: str = "other", default_unit: str = "g"
-) -> Ingredient:
-    existing = (
-        db.query(Ingredient)
-        .filter(func.lower(Ingredient.name) == name.strip().lower())
+from app.models.meal_plan import MealSlot
+from app.models.names import normalize_name
+from app.models.recipe import Recipe
+from app.services.grocery_rollup import refresh_for_slots, refresh_rollup
+from app.services.ingredients import resolve_ingredients
+from app.services.meal_plans import get_or_create_week_plans, week_start_for
+from app.services.name_index import recipe_names
+from app.services.recipe_cache import recipe_cache
+from app.services.recipe_ingredients import (
+    insert_recipe_ingredients,
+    sync_recipe_ingredients,
+)
+
+# Minimum trigram similarity for a near-miss name to count as a match. New
+# ingredients are cheap to create but hard to clean up, so only close
+# spellings ("tomatoe", "garlic clove") reuse an existing row. Recipe
+# lookups feed write tools, so they need a close spelling with no rival.
+RECIPE_MATCH_THRESHOLD = 0.8
+INGREDIENT_MATCH_THRESHOLD = 0.8
+
+
+def find_recipe(db: Session, name: str) -> Recipe:
+    """Find the recipe a write tool refers to, by name or one close spelling.
+
+    Raises ValueError when nothing is close enough or several recipes are,
+    so the model asks instead of editing the wrong recipe.
+    """
+    recipe = (
+        db.query(Recipe)
+        .filter(Recipe.name_key == normalize_name(name))
+        .order_by(Recipe.id)
         .first()
     )
-    if existing:
-        return existing
-    ingredient = Ingredient(
-        name=name.strip(), category=category, default_unit=default_unit
+    if recipe:
+        return recipe
+    matches = recipe_names.matches(db, name, RECIPE_MATCH_THRESHOLD)
+    if not matches:
+        raise ValueError(f"Recipe '{name}' not found")
+    if len(matches) > 1:
+        candidates = db.scalars(
+            select(Recipe.name).where(Recipe.id.in_([id_ for id_, _ in matches]))
+        )
+        raise ValueError(
+            f"Recipe '{name}' is ambiguous, it could be: "
+            + ", ".join(f"'{c}'" for c in sorted(candidates))
+        )
+    return db.get(Recipe, matches[0][0])
+
+
+def resolve_tool_ingredients(db: Session, items: list[dict]) -> list[Ingredient]:
+    # One SELECT and at most one INSERT for the whole ingredient list
+    return resolve_ingredients(
+        db,
+        [
+            (item["name"], item.get("category", "other"), item.get("unit", "g"))
+            for item in items
+        ],
+        INGREDIENT_MATCH_THRESHOLD,
     )
-    db.add(ingredient)
-    db.flush()
-    return ingredient
 
 
 def execute_create_recipe(db: Session, input_data: dict) -> dict:
@@ -35,41 +73,33 @@ def execute_create_recipe(db: Session, input_data: dict) -> dict:
         prep_time_min=input_data.get("prep_time_min"),
         cook_time_min=input_data.get("cook_time_min"),
         instructions=input_data.get("instructions"),
-        tags=json.dumps(input_data.get("tags", [])),
+        tag_list=input_data.get("tags", []),
     )
     db.add(recipe)
     db.flush()
 
-    for ing_data in input_data.get("ingredients", []):
-        ingredient = find_or_create_ingredient(
-            db,
-            name=ing_data["name"],
-            category=ing_data.get("category", "other"),
-            default_unit=ing_data.get("unit", "g"),
-        )
-        ri = RecipeIngredient(
-            recipe_id=recipe.id,
-            ingredient_id=ingredient.id,
-            quantity=ing_data.get("quantity", 0),
-            unit=ing_data.get("unit", "g"),
-            preparation=ing_data.get("preparation"),
-            optional=ing_data.get("optional", False),
-        )
-        db.add(ri)
-
+    items = input_data.get("ingredients", [])
+    insert_recipe_ingredients(
+        db,
+        recipe.id,
+        [
+            {
+                "ingredient_id": ingredient.id,
+                "quantity": ing_data.get("quantity", 0),
+                "unit": ing_data.get("unit", "g"),
+                "preparation": ing_data.get("preparation"),
+                "optional": ing_data.get("optional", False),
+            }
+            for ing_data, ingredient in zip(items, resolve_tool_ingredients(db, items))
+        ],
+    )
     db.commit()
     return {"recipe_id": recipe.id, "recipe_name": recipe.name}
 
 
 def execute_update_recipe(db: Session, input_data: dict) -> dict:
-    recipe_name = input_data["recipe_name"]
-    recipe = (
-        db.query(Recipe)
-        .filter(func.lower(Recipe.name) == recipe_name.strip().lower())
-        .first()
-    )
-    if not recipe:
-        raise ValueError(f"Recipe '{recipe_name}' not found")
+    recipe = find_recipe(db, input_data["recipe_name"])
+    matched_name = recipe.name
 
     # Update scalar fields if provided
     if "new_name" in input_data:
@@ -85,59 +115,47 @@ def execute_update_recipe(db: Session, input_data: dict) -> dict:
     if "instructions" in input_data:
         recipe.instructions = input_data["instructions"]
     if "tags" in input_data:
-        recipe.tags = json.dumps(input_data["tags"])
+        recipe.tag_list = input_data["tags"]
 
-    # Replace ingredients if provided
+    result = {}
+    # Replace ingredients if provided, writing only the rows that differ
     if "ingredients" in input_data:
-        # Delete existing recipe ingredients
-        db.query(RecipeIngredient).filter(
-            RecipeIngredient.recipe_id == recipe.id
-        ).delete()
-        db.flush()
-
-        for ing_data in input_data["ingredients"]:
-            ingredient = find_or_create_ingredient(
-                db,
-                name=ing_data["name"],
-                category=ing_data.get("category", "other"),
-                default_unit=ing_data.get("unit", "g"),
-            )
-            ri = RecipeIngredient(
-                recipe_id=recipe.id,
-                ingredient_id=ingredient.id,
-                quantity=ing_data.get("quantity", 0),
-                unit=ing_data.get("unit", "g"),
-                preparation=ing_data.get("preparation"),
-                optional=ing_data.get("optional", False),
-            )
-            db.add(ri)
+        items = input_data["ingredients"]
+        desired = [
+            {
+                "ingredient_id": ingredient.id,
+                "quantity": ing_data.get("quantity", 0),
+                "unit": ing_data.get("unit", "g"),
+                "preparation": ing_data.get("preparation"),
+                "optional": ing_data.get("optional", False),
+            }
+            for ing_data, ingredient in zip(items, resolve_tool_ingredients(db, items))
+        ]
+        diff = sync_recipe_ingredients(db, recipe, desired)
+        if diff:
+            refresh_rollup(db, recipe_ids=[recipe.id])
+        result = {
+            "ingredients_added": len(diff.added),
+            "ingredients_changed": len(diff.changed),
+            "ingredients_removed": len(diff.removed),
+        }
 
     db.commit()
-    return {"recipe_id": recipe.id, "recipe_name": recipe.name}
+    recipe_cache.invalidate(recipe.id)
+    return {
+        "recipe_id": recipe.id,
+        "recipe_name": recipe.name,
+        "matched_recipe_name": matched_name,
+        **result,
+    }
 
 
 def execute_add_to_plan(db: Session, input_data: dict) -> dict:
-    recipe_name = input_data["recipe_name"]
-    recipe = (
-        db.query(Recipe)
-        .filter(func.lower(Recipe.name) == recipe_name.strip().lower())
-        .first()
-    )
-    if not recipe:
-        raise ValueError(f"Recipe '{recipe_name}' not found")
+    recipe = find_recipe(db, input_data["recipe_name"])
 
     slot_date = date.fromisoformat(input_data["date"])
-    # Compute Saturday start of that week (Sat-Fri weeks)
-    days_since_saturday = (slot_date.weekday() - 5) % 7
-    week_start = slot_date - timedelta(days=days_since_saturday)
-
-    week_plan = (
-        db.query(WeekPlan).filter(WeekPlan.week_start == week_start).first()
-    )
-    if not week_plan:
-        week_plan = WeekPlan(week_start=week_start)
-        db.add(week_plan)
-        db.flush()
+    week_start = week_start_for(slot_date)
+    week_plan = get_or_create_week_plans(db, [week_start])[week_start]
 
     meal_type = input_data.get("meal_type", "dinner")
     slot = MealSlot(
@@ -148,6 +166,7 @@ def execute_add_to_plan(db: Session, input_data: dict) -> dict:
         notes=input_data.get("notes"),
     )
     db.add(slot)
+    refresh_for_slots(db, [(week_plan.id, recipe.id)])
     db.commit()
 
     return {
@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+
+from sqlalchemy import case, func
+from sqlalchemy.sql import ColumnElement
+
+MASS = "mass"
+VOLUME = "volume"
+COUNT = "count"
+
+# Every dimension aggregates into its base unit.
+BASE_UNITS = {MASS: "g", VOLUME: "ml", COUNT: "unit"}
+
+
+@dataclass(frozen=True)
+class UnitDef:
+    dimension: str
+    factor: float  # multiplier to the dimension's base unit
+
+
+_registry: dict[str, UnitDef] = {}
+
+
+def register_unit(dimension: str, factor: float, *names: str) -> None:
+    if dimension not in BASE_UNITS:
+        raise ValueError(f"Unknown dimension: {dimension}")
+    for name in names:
+        _registry[name.strip().lower()] = UnitDef(dimension, factor)
+
+
+def lookup_unit(name: str) -> UnitDef | None:
+    return _registry.get(name.strip().lower())
+
+
+register_unit(MASS, 1.0, "g", "gram", "grams")
+register_unit(MASS, 1000.0, "kg", "kilogram", "kilograms")
+register_unit(MASS, 0.001, "mg", "milligram", "milligrams")
+register_unit(MASS, 28.349523125, "oz", "ounce", "ounces")
+register_unit(MASS, 453.59237, "lb", "lbs", "pound", "pounds")
+register_unit(VOLUME, 1.0, "ml", "milliliter", "milliliters", "millilitre", "millilitres")
+register_unit(VOLUME, 10.0, "cl")
+register_unit(VOLUME, 100.0, "dl")
+register_unit(VOLUME, 1000.0, "l", "liter", "liters", "litre", "litres")
+register_unit(VOLUME, 4.92892159375, "tsp", "teaspoon", "teaspoons")
+register_unit(VOLUME, 14.78676478125, "tbsp", "tablespoon", "tablespoons")
+register_unit(VOLUME, 29.5735295625, "fl oz")
+register_unit(VOLUME, 240.0, "cup", "cups")
+register_unit(COUNT, 1.0, "unit", "units", "piece", "pieces", "pc", "pcs", "each", "whole")
+
+
+def _unit_key(unit: ColumnElement) -> ColumnElement:
+    return func.lower(func.trim(unit))
+
+
+def _dimension_of(unit: ColumnElement) -> ColumnElement:
+    return case(
+        {name: d.dimension for name, d in _registry.items()},
+        value=_unit_key(unit),
+        else_=None,
+    )
+
+
+def _factor_of(unit: ColumnElement) -> ColumnElement:
+    return case(
+        {name: d.factor for name, d in _registry.items()},
+        value=_unit_key(unit),
+        else_=1.0,
+    )
+
+
+def _base_unit_of(dimension: ColumnElement) -> ColumnElement:
+    return case(BASE_UNITS, value=dimension, else_=None)
+
+
+def normalized(
+    quantity: ColumnElement,
+    unit: ColumnElement,
+    default_unit: ColumnElement,
+    density: ColumnElement,
+    unit_weight: ColumnElement,
+) -> tuple[ColumnElement, ColumnElement]:
+    """Build SQL expressions for (quantity, unit) in an ingredient's canonical unit.
+
+    The canonical unit is the base unit of the dimension of the ingredient's
+    ``default_unit``. Rows in another dimension are converted through grams
+    using the ingredient's ``density`` (g/ml) or ``unit_weight`` (g/unit)
+    when those are set, and otherwise fall back to their own base unit.
+    Units missing from the registry pass through unchanged.
+    """
+    dim = _dimension_of(unit)
+    target = _dimension_of(default_unit)
+    base_qty = quantity * _factor_of(unit)
+
+    grams = case(
+        (dim == MASS, base_qty),
+        (dim == VOLUME, base_qty * density),
+        (dim == COUNT, base_qty * unit_weight),
+        else_=None,
+    )
+    converted = case(
+        (target == MASS, grams),
+        # A zero factor converts nothing, rather than failing on PostgreSQL
+        (target == VOLUME, grams / func.nullif(density, 0)),
+        (target == COUNT, grams / func.nullif(unit_weight, 0)),
+        else_=None,
+    )
+
+    norm_quantity = case(
+        (dim.is_(None), quantity),
+        (dim == target, base_qty),
+        (converted.is_not(None), converted),
+        else_=base_qty,
+    )
+    norm_unit = case(
+        (dim.is_(None), unit),
+        (dim == target, _base_unit_of(target)),
+        (converted.is_not(None), _base_unit_of(target)),
+        else_=_base_unit_of(dim),
+    )
+    return norm_quantity, norm_unit
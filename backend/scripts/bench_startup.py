@@ -0,0 +1,94 @@
+"""Benchmark cold start: seconds from launching the server to its first
+healthy response.
+
+Each run starts uvicorn in a fresh process against a scratch SQLite
+database and polls /api/health. The first run migrates the empty database;
+later runs start with the schema at head. For comparison, the same is timed
+with ``alembic upgrade head`` run as a separate process first, as start.sh
+used to do.
+
+    cd backend
+    ../venv/bin/python scripts/bench_startup.py --runs 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_healthy(env: dict, alembic_first: bool, timeout: float = 60.0) -> float:
+    port = _free_port()
+    start = time.perf_counter()
+    if alembic_first:
+        subprocess.run(
+            [sys.executable, "-m", "alembic", "upgrade", "head"],
+            cwd=BACKEND,
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        cwd=BACKEND,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("server exited during startup")
+            try:
+                with urllib.request.urlopen(
+                    f"http://127.0.0.1:{port}/api/health", timeout=1
+                ) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError(f"no healthy response within {timeout}s")
+            time.sleep(0.01)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for label, alembic_first in (
+        ("in-process migrator", False),
+        ("alembic CLI, then server", True),
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp}/bench.db"}
+            fresh = time_to_healthy(env, alembic_first)
+            at_head = [time_to_healthy(env, alembic_first) for _ in range(args.runs)]
+        print(
+            f"{label}: empty database {fresh:.2f}s, at head median "
+            f"{statistics.median(at_head):.2f}s (min {min(at_head):.2f}s, "
+            f"{args.runs} runs)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import os
+import tempfile
+from pathlib import Path
+
+# Settings are read when app.config is imported, so point the app at the
+# test database before anything from it is loaded. TEST_DATABASE_URL runs
+# the suite against another backend, e.g. an empty PostgreSQL database;
+# otherwise it uses a scratch SQLite file.
+if "TEST_DATABASE_URL" in os.environ:
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+else:
+    _scratch = Path(tempfile.mkdtemp(prefix="mealz-tests-"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{_scratch / 'test.db'}"
+os.environ["ANTHROPIC_API_KEY"] = ""
+os.environ["MIGRATE_ON_STARTUP"] = "false"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.migrations import upgrade_to_head  # noqa: E402
+from app.services.name_index import _INDEXES  # noqa: E402
+from app.services.recipe_cache import recipe_cache  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema() -> None:
+    upgrade_to_head()
+
+
+# Tables seeded by migrations, kept between tests
+SEEDED_TABLES = {"name_key_generations"}
+
+
+@pytest.fixture(autouse=True)
+def _clean_database(_schema):
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.name not in SEEDED_TABLES:
+                conn.execute(table.delete())
+    recipe_cache.clear()
+    for indexes in _INDEXES.values():
+        for index in indexes:
+            index.invalidate()
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def statements():
+    """(SQL, parameters) of every statement the app's engine runs.
+
+    Clear the list right before the call being measured.
+    """
+    log: list[tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        log.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield log
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def create_ingredients(
+    client: TestClient, count: int, prefix: str = "ing"
+) -> list[int]:
+    return [
+        client.post("/api/ingredients", json={"name": f"{prefix} {i}"}).json()["id"]
+        for i in range(count)
+    ]
+
+
+def create_recipe(
+    client: TestClient, name: str, ingredient_ids: list[int], **fields
+) -> dict:
+    response = client.post(
+        "/api/recipes",
+        json={
+            "name": name,
+            "ingredients": [
+                {"ingredient_id": id_, "quantity": 100, "unit": "g"}
+                for id_ in ingredient_ids
+            ],
+            **fields,
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
@@ -0,0 +1,96 @@
+import re
+
+import pytest
+
+from app.database import engine
+from conftest import create_ingredients, create_recipe
+
+# A reference to a recipes column, directly or through an eager-load alias
+_RECIPE_COLUMN_RE = re.compile(r"\brecipes(?:_\d+)?\.(\w+)")
+
+SUMMARY_COLUMNS = {
+    "id",
+    "name",
+    "description",
+    "servings",
+    "prep_time_min",
+    "cook_time_min",
+}
+
+
+def _recipe_columns(statements) -> set[str]:
+    return {
+        column
+        for sql, _ in statements
+        if sql.startswith("SELECT")
+        for column in _RECIPE_COLUMN_RE.findall(sql)
+    }
+
+
+@pytest.fixture
+def week(client):
+    recipe = create_recipe(
+        client,
+        "Stew",
+        create_ingredients(client, 3),
+        description="Slow",
+        instructions="A long method. " * 500,
+        tags=["winter"],
+    )
+    plan = client.post("/api/meal-plans", json={"week_start": "2026-01-03"}).json()
+    slot = client.post(
+        f"/api/meal-plans/{plan['id']}/slots",
+        json={"date": "2026-01-04", "recipe_id": recipe["id"]},
+    ).json()
+    client.post(
+        "/api/meal-plans/templates", json={"name": "Winter", "week_plan_id": plan["id"]}
+    )
+    return plan["id"], slot["id"]
+
+
+@pytest.mark.parametrize(
+    "method, url, body",
+    [
+        ("get", "/api/meal-plans?week_start=2026-01-03", None),
+        ("get", "/api/meal-plans/range?from=2026-01-01&to=2026-01-31", None),
+        ("get", "/api/meal-plans/templates", None),
+        ("put", "/api/meal-plans/{plan}", {"notes": "Cold week"}),
+        ("put", "/api/meal-plans/{plan}/slots/{slot}", {"notes": "Double it"}),
+        ("post", "/api/meal-plans/{plan}/slots", {"date": "2026-01-05"}),
+        ("get", "/api/meal-plans/{plan}/grocery-list", None),
+        ("get", "/api/meal-plans/grocery-list?from=2026-01-01&to=2026-01-31", None),
+    ],
+)
+def test_calendar_and_grocery_read_only_recipe_names(
+    client, statements, week, method, url, body
+):
+    plan_id, slot_id = week
+    statements.clear()
+    response = client.request(
+        method, url.format(plan=plan_id, slot=slot_id), json=body
+    )
+    assert response.status_code < 300, response.text
+    assert _recipe_columns(statements) <= {"id", "name"}
+
+
+@pytest.mark.parametrize(
+    "url, extra",
+    [
+        ("/api/recipes", set()),
+        pytest.param(
+            "/api/recipes?search=stew",
+            set(),
+            marks=pytest.mark.skipif(
+                engine.dialect.name != "sqlite",
+                reason="the substring search fallback ranks on every text column",
+            ),
+        ),
+        ("/api/recipes/page", set()),
+        ("/api/recipes/page?sort=updated_at", {"updated_at"}),
+    ],
+)
+def test_recipe_lists_read_only_summary_columns(client, statements, week, url, extra):
+    statements.clear()
+    response = client.get(url)
+    assert response.status_code == 200, response.text
+    assert _recipe_columns(statements) <= SUMMARY_COLUMNS | extra
@@ -0,0 +1,61 @@
+import pytest
+
+from app.models.ingredient import Ingredient
+from conftest import create_recipe
+
+
+@pytest.mark.parametrize("field", ["density", "unit_weight"])
+@pytest.mark.parametrize("value", [0, -1.5])
+def test_conversion_factors_must_be_positive(client, field, value):
+    response = client.post("/api/ingredients", json={"name": "milk", field: value})
+    assert response.status_code == 422
+
+    ingredient = client.post("/api/ingredients", json={"name": "milk"}).json()
+    response = client.put(f"/api/ingredients/{ingredient['id']}", json={field: value})
+    assert response.status_code == 422
+
+
+def test_units_convert_through_density(client):
+    milk = client.post(
+        "/api/ingredients", json={"name": "milk", "default_unit": "ml", "density": 1.03}
+    ).json()
+    recipe = create_recipe(client, "Pudding", [])
+    client.put(
+        f"/api/recipes/{recipe['id']}",
+        json={
+            "ingredients": [
+                {"ingredient_id": milk["id"], "quantity": 1, "unit": "l"},
+                {"ingredient_id": milk["id"], "quantity": 103, "unit": "g"},
+            ]
+        },
+    )
+    plan = client.post("/api/meal-plans", json={"week_start": "2026-01-03"}).json()
+    client.post(
+        f"/api/meal-plans/{plan['id']}/slots",
+        json={"date": "2026-01-03", "recipe_id": recipe["id"]},
+    )
+
+    items = client.get(f"/api/meal-plans/{plan['id']}/grocery-list").json()
+    [item] = items["categories"]["other"]
+    assert item["unit"] == "ml"
+    assert item["total_quantity"] == pytest.approx(1100)
+
+
+def test_zero_density_from_older_rows_falls_back_to_grams(client, db):
+    milk = client.post(
+        "/api/ingredients", json={"name": "milk", "default_unit": "ml"}
+    ).json()
+    # Written before the API rejected zero factors
+    db.get(Ingredient, milk["id"]).density = 0
+    db.commit()
+    recipe = create_recipe(client, "Pudding", [milk["id"]])
+    plan = client.post("/api/meal-plans", json={"week_start": "2026-01-03"}).json()
+    client.post(
+        f"/api/meal-plans/{plan['id']}/slots",
+        json={"date": "2026-01-03", "recipe_id": recipe["id"]},
+    )
+
+    response = client.get(f"/api/meal-plans/{plan['id']}/grocery-list")
+    assert response.status_code == 200, response.text
+    [item] = response.json()["categories"]["other"]
+    assert (item["unit"], item["total_quantity"]) == ("g", 100)
@@ -0,0 +1,35 @@
+def _ingredient(client, name: str) -> int:
+    return client.post("/api/ingredients", json={"name": name}).json()["id"]
+
+
+def test_merge_folds_rows_a_recipe_had_for_both_ingredients(client):
+    tomato, tomatoes, onion = (
+        _ingredient(client, name) for name in ["tomato", "tomatoes", "onion"]
+    )
+    rows = [
+        (tomato, 100, "g"),
+        (onion, 1, "piece"),
+        (tomatoes, 50, "g"),
+        (tomatoes, 2, "piece"),
+    ]
+    recipe = client.post(
+        "/api/recipes",
+        json={
+            "name": "Sauce",
+            "ingredients": [
+                {"ingredient_id": id_, "quantity": quantity, "unit": unit}
+                for id_, quantity, unit in rows
+            ],
+        },
+    ).json()
+
+    response = client.post(
+        "/api/ingredients/merge", json=[{"target_id": tomato, "source_ids": [tomatoes]}]
+    )
+    assert response.status_code == 200, response.text
+
+    recipe = client.get(f"/api/recipes/{recipe['id']}").json()
+    assert [
+        (ri["ingredient_name"], ri["quantity"], ri["unit"])
+        for ri in recipe["ingredients"]
+    ] == [("tomato", 150, "g"), ("onion", 1, "piece"), ("tomato", 2, "piece")]
@@ -0,0 +1,127 @@
+import threading
+
+from sqlalchemy import event
+
+from app.database import SessionLocal, engine
+from app.models.ingredient import Ingredient
+from app.services.name_index import PrefixIndex, ingredient_prefixes
+from conftest import create_ingredients
+
+
+def _autocomplete(client, q: str) -> list[int]:
+    response = client.get("/api/ingredients/autocomplete", params={"q": q})
+    return [i["id"] for i in response.json()]
+
+
+def test_index_follows_its_own_process_without_reloading(client, statements):
+    first, second = create_ingredients(client, 2, prefix="basil")
+    assert _autocomplete(client, "basil") == [first, second]
+
+    client.put(f"/api/ingredients/{second}", json={"name": "thai basil"})
+    [third] = create_ingredients(client, 1, prefix="basil extra")
+    statements.clear()
+    assert _autocomplete(client, "basil") == [first, third, second]
+    assert not [sql for sql, _ in statements if "WHERE" not in sql]
+
+
+def test_index_reloads_after_another_process_changes_names(client, db):
+    # A second copy of the index stands in for another worker's, which this
+    # process's commits never reach
+    other = PrefixIndex(Ingredient)
+    ids = create_ingredients(client, 3, prefix="basil")
+    assert other.search(db, "basil", 10) == ids
+    db.rollback()
+
+    response = client.post(
+        "/api/ingredients/merge",
+        json=[{"target_id": ids[0], "source_ids": ids[1:]}],
+    )
+    assert response.status_code == 200, response.text
+    assert other.search(db, "basil", 10) == [ids[0]]
+    assert ingredient_prefixes.search(db, "basil", 10) == [ids[0]]
+
+
+def test_lookups_are_not_blocked_by_a_slow_load(client):
+    [basil] = create_ingredients(client, 1, prefix="basil")
+    index = PrefixIndex(Ingredient)
+    stalled, release = threading.Event(), threading.Event()
+
+    def stall_load(conn, cursor, statement, parameters, context, executemany):
+        if threading.current_thread().name == "slow" and statement.startswith(
+            "SELECT ingredients.id, ingredients.name_key"
+        ):
+            stalled.set()
+            release.wait(10)
+
+    def search(found: list) -> None:
+        with SessionLocal() as db:
+            found.extend(index.search(db, "basil", 10))
+
+    event.listen(engine, "before_cursor_execute", stall_load)
+    slow_found, fast_found = [], []
+    slow = threading.Thread(target=search, args=(slow_found,), name="slow")
+    fast = threading.Thread(target=search, args=(fast_found,))
+    try:
+        slow.start()
+        assert stalled.wait(10)
+        # The slow thread is stuck in its load query; with the lock held
+        # across it, this lookup would wait for it
+        fast.start()
+        fast.join(5)
+        assert not fast.is_alive()
+    finally:
+        release.set()
+        slow.join()
+        fast.join()
+        event.remove(engine, "before_cursor_execute", stall_load)
+    assert slow_found == fast_found == [basil]
+
+
+def test_savepoint_rollback_undoes_only_its_own_changes(db, statements):
+    assert ingredient_prefixes.search(db, "basil", 10) == []
+    with db.begin_nested():
+        basil = Ingredient(name="basil")
+        db.add(basil)
+    try:
+        with db.begin_nested():
+            db.add(Ingredient(name="basil leaf"))
+            db.flush()
+            raise ValueError
+    except ValueError:
+        pass
+    db.commit()
+
+    statements.clear()
+    assert ingredient_prefixes.search(db, "basil", 10) == [basil.id]
+    # Applied from the commit, not reloaded
+    assert not [sql for sql, _ in statements if "WHERE" not in sql]
+
+
+def test_released_savepoint_waits_for_the_outer_commit(db):
+    assert ingredient_prefixes.search(db, "basil", 10) == []
+    # Write first: pysqlite only opens the transaction at the first write,
+    # and a savepoint outside one commits when released
+    db.add(Ingredient(name="thyme"))
+    db.flush()
+    with db.begin_nested():
+        db.add(Ingredient(name="basil"))
+    db.rollback()
+    # Bring the name key generation back to where the savepoint left it, so
+    # an index holding the rolled back rows would look current
+    for name in ["sage", "sage leaf"]:
+        db.add(Ingredient(name=name))
+        db.commit()
+
+    assert ingredient_prefixes.search(db, "basil", 10) == []
+    assert len(ingredient_prefixes.search(db, "sage", 10)) == 2
+
+
+def test_bulk_build_matches_adding_rows_one_by_one():
+    rows = [(3, "sweet basil"), (1, "basil"), (2, "thai sweet basil"), (4, "anise")]
+    index = PrefixIndex(Ingredient)
+    built = index._empty()
+    index._build(built, rows)
+    added = index._empty()
+    for id_, key in rows:
+        index._add(added, id_, key)
+    assert built == added
@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+
+from conftest import create_ingredients, create_recipe
+
+
+def _week_plan(client, week_start: date, slots: int, ingredients: int) -> int:
+    ids = create_ingredients(client, ingredients, prefix=f"ing {week_start}")
+    recipe = create_recipe(client, f"Stew {week_start}", ids)
+    plan = client.post("/api/meal-plans", json={"week_start": str(week_start)}).json()
+    for day in range(slots):
+        slot_date = week_start + timedelta(days=day)
+        response = client.post(
+            f"/api/meal-plans/{plan['id']}/slots",
+            json={"date": str(slot_date), "recipe_id": recipe["id"]},
+        )
+        assert response.status_code == 201, response.text
+    return plan["id"]
+
+
+def test_grocery_list_statement_count_is_flat(client, statements):
+    counts = []
+    for week, (slots, ingredients) in enumerate([(1, 1), (7, 12)]):
+        plan_id = _week_plan(
+            client, date(2026, 1, 3) + timedelta(weeks=week), slots, ingredients
+        )
+        statements.clear()
+        response = client.get(f"/api/meal-plans/{plan_id}/grocery-list")
+        assert response.status_code == 200
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+
+def test_range_grocery_list_statement_count_is_flat(client, statements):
+    counts = []
+    for start, weeks in [(date(2026, 1, 3), 1), (date(2026, 2, 7), 4)]:
+        for week in range(weeks):
+            _week_plan(client, start + timedelta(weeks=week), 7, 5)
+        end = start + timedelta(weeks=weeks, days=-1)
+        statements.clear()
+        response = client.get(
+            "/api/meal-plans/grocery-list",
+            params={"from": str(start), "to": str(end)},
+        )
+        assert response.status_code == 200
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+
+def test_recipe_create_statement_count_is_flat(client, statements):
+    ids = create_ingredients(client, 20)
+    counts = []
+    for size in (1, 20):
+        statements.clear()
+        create_recipe(client, f"Soup {size}", ids[:size], tags=["quick", "soup"])
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+
+def test_recipe_update_statement_count_is_flat(client, statements):
+    ids = create_ingredients(client, 40)
+    counts = []
+    for size in (1, 20):
+        recipe = create_recipe(client, f"Soup {size}", ids[:size])
+        # Change every existing row, add as many again and drop none
+        statements.clear()
+        response = client.put(
+            f"/api/recipes/{recipe['id']}",
+            json={
+                "ingredients": [
+                    {"ingredient_id": id_, "quantity": 250, "unit": "g"}
+                    for id_ in ids[: 2 * size]
+                ]
+            },
+        )
+        assert response.status_code == 200, response.text
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
@@ -0,0 +1,274 @@
+import re
+
+import pytest
+
+from app.database import Base, SessionLocal, engine
+from app.services.name_index import (
+    ingredient_names,
+    ingredient_prefixes,
+    recipe_names,
+)
+from app.services.tool_executor import (
+    execute_add_to_plan,
+    execute_create_recipe,
+    execute_update_recipe,
+)
+from conftest import create_ingredients, create_recipe
+
+pytestmark = pytest.mark.skipif(
+    engine.dialect.name != "sqlite", reason="plans are read with SQLite's EXPLAIN"
+)
+
+# A plan step that reads a whole table, or walks a whole index of it, instead
+# of seeking into an index. Eager-load aliases carry a numeric suffix.
+_SCAN_RE = re.compile(r"^SCAN (\w+?)(?:_\d+)? *(?:USING (?:COVERING )?INDEX \w+)?$")
+
+# (request, table) pairs whose scan is the point of the request, not a
+# missing index
+ALLOWED_SCANS = {
+    # Lists every recipe, in name order
+    ("recipe list", "recipes"),
+    # Counts every tag; walks the (tag, recipe_id) index once
+    ("tag facets", "recipe_tags"),
+    # Lists every template
+    ("template list", "week_templates"),
+}
+
+HOT_REQUESTS = [
+    ("recipe list", "get", "/api/recipes", None),
+    ("recipe search", "get", "/api/recipes?search=stew", None),
+    ("recipes by tag", "get", "/api/recipes?tags=quick&tags=winter", None),
+    ("recipes by any tag", "get", "/api/recipes?tags=quick&tag_mode=any", None),
+    ("recipe page by name", "get", "/api/recipes/page?limit=1&cursor={name}", None),
+    (
+        "recipe page by created_at",
+        "get",
+        "/api/recipes/page?limit=1&sort=created_at&cursor={created_at}",
+        None,
+    ),
+    (
+        "recipe page by updated_at",
+        "get",
+        "/api/recipes/page?limit=1&sort=updated_at&order=desc&cursor={updated_at}",
+        None,
+    ),
+    ("tag facets", "get", "/api/recipes/tags", None),
+    ("recipe detail", "get", "/api/recipes/{recipe}", None),
+    (
+        "recipe create",
+        "post",
+        "/api/recipes",
+        {
+            "name": "Chili",
+            "ingredients": [{"ingredient_id": "{ingredient}", "quantity": 1}],
+        },
+    ),
+    (
+        "recipe edit",
+        "put",
+        "/api/recipes/{recipe}",
+        {
+            "servings": 6,
+            "tags": ["hearty"],
+            "ingredients": [{"ingredient_id": "{ingredient}", "quantity": 1}],
+        },
+    ),
+    ("recipe delete", "delete", "/api/recipes/{recipe}", None),
+    ("ingredient autocomplete", "get", "/api/ingredients/autocomplete?q=ing", None),
+    ("ingredient resolve", "post", "/api/ingredients/resolve", [{"name": "Ing 1"}]),
+    (
+        "ingredient merge",
+        "post",
+        "/api/ingredients/merge",
+        [{"target_id": "{ingredient}", "source_ids": ["{duplicate}"]}],
+    ),
+    ("week plan", "get", "/api/meal-plans?week_start=2026-01-03", None),
+    ("week range", "get", "/api/meal-plans/range?from=2026-01-01&to=2026-01-31", None),
+    ("template list", "get", "/api/meal-plans/templates", None),
+    ("week grocery list", "get", "/api/meal-plans/{plan}/grocery-list", None),
+    (
+        "range grocery list",
+        "get",
+        "/api/meal-plans/grocery-list?from=2026-01-01&to=2026-01-31",
+        None,
+    ),
+    (
+        "slot add",
+        "post",
+        "/api/meal-plans/{plan}/slots",
+        {"date": "2026-01-05", "recipe_id": "{recipe}"},
+    ),
+    ("slot edit", "put", "/api/meal-plans/{plan}/slots/{slot}", {"notes": "Double"}),
+    ("slot delete", "delete", "/api/meal-plans/{plan}/slots/{slot}", None),
+    (
+        "slot batch",
+        "post",
+        "/api/meal-plans/slots/batch",
+        {
+            "operations": [
+                {"op": "create", "slot": {"date": "2026-01-12"}},
+                {
+                    "op": "move",
+                    "slot_id": "{slot}",
+                    "version": "{slot_version}",
+                    "date": "2026-01-13",
+                },
+            ]
+        },
+    ),
+    (
+        "week copy",
+        "post",
+        "/api/meal-plans/{plan}/copy",
+        {"target_week_starts": ["2026-01-10", "2026-01-17"], "replace": True},
+    ),
+    (
+        "template apply",
+        "post",
+        "/api/meal-plans/templates/{template}/apply",
+        {"target_week_starts": ["2026-01-10", "2026-01-17"], "replace": True},
+    ),
+    ("chat history", "get", "/api/chat/sessions/{session}/messages", None),
+]
+
+# The chat's write tools, which look recipes and ingredients up by name
+TOOL_CALLS = [
+    (
+        "tool create recipe",
+        execute_create_recipe,
+        {
+            "name": "Chili",
+            "instructions": "",
+            "ingredients": [{"name": "ing 0", "quantity": 1}, {"name": "beans"}],
+        },
+    ),
+    (
+        "tool update recipe",
+        execute_update_recipe,
+        {
+            "recipe_name": "stew",
+            "tags": ["hearty"],
+            "ingredients": [{"name": "ing 1", "quantity": 2}],
+        },
+    ),
+    (
+        "tool add to plan",
+        execute_add_to_plan,
+        {"recipe_name": "Soup", "date": "2026-01-06"},
+    ),
+]
+
+
+@pytest.fixture
+def book(client) -> dict:
+    """A few recipes in a planned week, and the ids and cursors to reach them."""
+    ids = create_ingredients(client, 3)
+    recipes = [
+        create_recipe(client, name, ids, tags=tags)
+        for name, tags in [
+            ("Stew", ["winter", "quick"]),
+            ("Soup", ["winter"]),
+            ("Salad", ["quick"]),
+        ]
+    ]
+    plan = client.post("/api/meal-plans", json={"week_start": "2026-01-03"}).json()
+    slot = client.post(
+        f"/api/meal-plans/{plan['id']}/slots",
+        json={"date": "2026-01-04", "recipe_id": recipes[0]["id"]},
+    ).json()
+    template = client.post(
+        "/api/meal-plans/templates", json={"name": "Winter", "week_plan_id": plan["id"]}
+    ).json()
+    session = client.post("/api/chat/sessions", json={}).json()
+    # Build the in-memory name indexes now: their one-off load reads the
+    # whole table by design
+    with SessionLocal() as db:
+        recipe_names.matches(db, "stew", 1)
+        ingredient_names.matches(db, "ing", 1)
+        ingredient_prefixes.search(db, "ing", 1)
+    cursors = {
+        sort: client.get(
+            "/api/recipes/page", params={"limit": 1, "sort": sort, "order": order}
+        ).json()["next_cursor"]
+        for sort, order in [
+            ("name", "asc"),
+            ("created_at", "asc"),
+            ("updated_at", "desc"),
+        ]
+    }
+    return {
+        "ingredient": ids[0],
+        "duplicate": ids[2],
+        "recipe": recipes[0]["id"],
+        "plan": plan["id"],
+        "slot": slot["id"],
+        "slot_version": slot["version"],
+        "template": template["id"],
+        "session": session["id"],
+        **cursors,
+    }
+
+
+def _fill(body, book: dict):
+    # Sample bodies name the ids they refer to as "{key}" of the book
+    if isinstance(body, list):
+        return [_fill(item, book) for item in body]
+    if isinstance(body, dict):
+        return {key: _fill(value, book) for key, value in body.items()}
+    if isinstance(body, str) and (m := re.fullmatch(r"\{(\w+)\}", body)):
+        return book[m.group(1)]
+    return body
+
+
+def _scans(statements) -> dict[str, list[str]]:
+    """Map each table read by a full scan to the offending plan steps."""
+    tables = set(Base.metadata.tables)
+    found: dict[str, list[str]] = {}
+    with engine.connect() as conn:
+        for sql, parameters in statements:
+            if not sql.startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")):
+                continue
+            if isinstance(parameters, list):  # executemany
+                continue
+            for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters):
+                m = _SCAN_RE.match(row.detail)
+                if m and m.group(1) in tables:
+                    found.setdefault(m.group(1), []).append(row.detail)
+    return found
+
+
+@pytest.mark.parametrize(
+    "name, method, url, body", HOT_REQUESTS, ids=[r[0] for r in HOT_REQUESTS]
+)
+def test_hot_requests_are_answered_from_indexes(
+    client, statements, book, name, method, url, body
+):
+    statements.clear()
+    response = client.request(
+        method, url.format(**book), json=_fill(body, book)
+    )
+    assert response.status_code < 300, response.text
+    # Copy first: explaining runs through the engine and is recorded too
+    scans = _scans(list(statements))
+    unexpected = {
+        table: steps
+        for table, steps in scans.items()
+        if (name, table) not in ALLOWED_SCANS
+    }
+    assert not unexpected
+
+
+@pytest.mark.parametrize(
+    "name, tool, input_data", TOOL_CALLS, ids=[c[0] for c in TOOL_CALLS]
+)
+def test_chat_tools_are_answered_from_indexes(
+    db, statements, book, name, tool, input_data
+):
+    statements.clear()
+    tool(db, input_data)
+    scans = _scans(list(statements))
+    assert not {
+        table: steps
+        for table, steps in scans.items()
+        if (name, table) not in ALLOWED_SCANS
+    }
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from app.models.recipe import Recipe
+from app.services.recipe_cache import RecipeCache, recipe_cache
+
+SAVED = datetime(2026, 1, 3, 12, 0, 0)
+
+
+def test_put_after_invalidation_is_dropped():
+    cache = RecipeCache(8)
+    generation = cache.generation(1)
+    # A writer commits within the same second and invalidates while the
+    # reader is still building its body from the old row
+    cache.invalidate(1)
+    cache.put(1, SAVED, b"stale", generation)
+    assert cache.get(1, SAVED) is None
+
+    cache.put(1, SAVED, b"fresh", cache.generation(1))
+    assert cache.get(1, SAVED) == b"fresh"
+
+
+def test_put_after_clear_is_dropped():
+    cache = RecipeCache(8)
+    generation = cache.generation(1)
+    cache.clear()
+    cache.put(1, SAVED, b"stale", generation)
+    assert cache.get(1, SAVED) is None
+
+
+def test_entry_is_served_until_the_recipe_changes(client):
+    recipe = client.post("/api/recipes", json={"name": "Toast"}).json()
+    client.get(f"/api/recipes/{recipe['id']}")
+    before = client.get("/api/recipes/cache/stats").json()
+    assert client.get(f"/api/recipes/{recipe['id']}").json()["name"] == "Toast"
+    assert client.get("/api/recipes/cache/stats").json()["hits"] == before["hits"] + 1
+
+    client.put(f"/api/recipes/{recipe['id']}", json={"name": "Cheese toast"})
+    assert client.get(f"/api/recipes/{recipe['id']}").json()["name"] == "Cheese toast"
+
+
+def test_tag_only_edit_is_seen_by_other_workers_caches(client, db):
+    recipe = client.post("/api/recipes", json={"name": "Toast", "tags": ["quick"]})
+    recipe_id = recipe.json()["id"]
+    db.get(Recipe, recipe_id).updated_at = SAVED
+    db.commit()
+    stale = client.get(f"/api/recipes/{recipe_id}").content
+
+    client.put(f"/api/recipes/{recipe_id}", json={"tags": ["breakfast"]})
+    # Another worker still holds the body it built before the edit; only
+    # its updated_at check can tell it to rebuild
+    recipe_cache.put(recipe_id, SAVED, stale, recipe_cache.generation(recipe_id))
+    assert client.get(f"/api/recipes/{recipe_id}").json()["tags"] == ["breakfast"]
@@ -0,0 +1,45 @@
+import json
+
+
+def _ndjson(records: list[dict]) -> bytes:
+    return "\n".join(json.dumps(r) for r in records).encode()
+
+
+def test_import_writes_each_table_in_one_statement(client, statements):
+    records = [
+        {
+            "name": f"Recipe {i}",
+            "tags": ["imported"],
+            "ingredients": [
+                {"name": f"ingredient {i % 7}", "quantity": i, "unit": "g"}
+            ],
+        }
+        for i in range(300)
+    ]
+    statements.clear()
+    response = client.post("/api/recipes/import", content=_ndjson(records))
+    assert response.json() == {"imported": 300, "failed": 0, "errors": []}
+
+    inserts = [sql for sql, _ in statements if sql.startswith("INSERT INTO")]
+    assert len([sql for sql in inserts if sql.startswith("INSERT INTO recipes ")]) == 1
+    assert len(inserts) == 4  # ingredients, recipes, tags, recipe ingredients
+
+
+def test_import_matches_rows_to_records_with_repeated_names(client):
+    records = [
+        {
+            "name": "Curry" if i % 2 else "curry ",
+            "tags": [f"tag {i}"],
+            "ingredients": [{"name": f"spice {i}", "quantity": i + 1, "unit": "g"}],
+        }
+        for i in range(6)
+    ]
+    response = client.post("/api/recipes/import", content=_ndjson(records))
+    assert response.json()["imported"] == 6
+
+    recipes = sorted(client.get("/api/recipes").json(), key=lambda r: r["id"])
+    for i, summary in enumerate(recipes):
+        recipe = client.get(f"/api/recipes/{summary['id']}").json()
+        assert recipe["name"] == records[i]["name"]
+        assert recipe["tags"] == [f"tag {i}"]
+        assert [ri["ingredient_name"] for ri in recipe["ingredients"]] == [f"spice {i}"]
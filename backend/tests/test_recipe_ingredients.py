@@ -0,0 +1,61 @@
+from conftest import create_ingredients, create_recipe
+
+
+def _put_ingredients(client, recipe_id: int, rows: list[tuple[int, float]]) -> dict:
+    response = client.put(
+        f"/api/recipes/{recipe_id}",
+        json={
+            "ingredients": [
+                {"ingredient_id": id_, "quantity": quantity, "unit": "g"}
+                for id_, quantity in rows
+            ]
+        },
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _names(recipe: dict) -> list[str]:
+    return [ri["ingredient_name"] for ri in recipe["ingredients"]]
+
+
+def test_update_writes_only_rows_that_differ(client):
+    a, b, c, d = create_ingredients(client, 4)
+    recipe = create_recipe(client, "Salad", [a, b, c])
+    row_ids = {ri["ingredient_id"]: ri["id"] for ri in recipe["ingredients"]}
+
+    result = _put_ingredients(client, recipe["id"], [(a, 100), (b, 150), (d, 5)])
+
+    assert result["ingredient_changes"]["changed"] == [row_ids[b]]
+    assert result["ingredient_changes"]["removed"] == [row_ids[c]]
+    assert len(result["ingredient_changes"]["added"]) == 1
+    assert _names(result) == ["ing 0", "ing 1", "ing 3"]
+    assert result["ingredients"][0]["id"] == row_ids[a]
+
+
+def test_reorder_only_update_is_kept(client):
+    a, b, c = create_ingredients(client, 3)
+    recipe = create_recipe(client, "Salad", [a, b, c])
+    row_ids = [ri["id"] for ri in recipe["ingredients"]]
+
+    result = _put_ingredients(client, recipe["id"], [(c, 100), (b, 100), (a, 100)])
+
+    changes = result["ingredient_changes"]
+    assert sorted(changes["changed"]) == [row_ids[0], row_ids[2]]
+    assert changes["added"] == changes["removed"] == []
+    assert _names(result) == ["ing 2", "ing 1", "ing 0"]
+    assert _names(client.get(f"/api/recipes/{recipe['id']}").json()) == [
+        "ing 2",
+        "ing 1",
+        "ing 0",
+    ]
+
+
+def test_unchanged_update_reports_no_changes(client):
+    a, b = create_ingredients(client, 2)
+    recipe = create_recipe(client, "Salad", [a, b])
+
+    result = _put_ingredients(client, recipe["id"], [(a, 100), (b, 100)])
+
+    assert result["ingredient_changes"] == {"added": [], "changed": [], "removed": []}
+    assert result["updated_at"] == recipe["updated_at"]
@@ -0,0 +1,13 @@
+from app.routers.recipes import MAX_PAGE_SIZE
+
+
+def test_list_is_capped_by_limit(client):
+    for name in ["Stew", "Soup", "Salad"]:
+        client.post("/api/recipes", json={"name": name})
+
+    response = client.get("/api/recipes", params={"limit": 2})
+    assert [r["name"] for r in response.json()] == ["Salad", "Soup"]
+    assert len(client.get("/api/recipes").json()) == 3
+
+    response = client.get("/api/recipes", params={"limit": MAX_PAGE_SIZE + 1})
+    assert response.status_code == 422
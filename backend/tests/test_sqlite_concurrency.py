@@ -0,0 +1,76 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine
+from app.main import app
+from app.models.ingredient import Ingredient
+
+pytestmark = pytest.mark.skipif(
+    engine.dialect.name != "sqlite", reason="checks SQLite's file locking"
+)
+
+
+def test_connections_use_wal(db):
+    assert db.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+    busy_timeout = db.execute(text("PRAGMA busy_timeout")).scalar()
+    assert busy_timeout == settings.sqlite_busy_timeout_ms
+
+
+def test_readers_are_not_blocked_by_an_open_write(client, db):
+    client.post("/api/ingredients", json={"name": "salt"})
+    # Hold the write lock, uncommitted, while the readers run
+    db.add(Ingredient(name="pepper"))
+    db.flush()
+
+    def read(_) -> tuple[float, list[str]]:
+        started = time.monotonic()
+        response = TestClient(app).get("/api/ingredients")
+        assert response.status_code == 200, response.text
+        return time.monotonic() - started, [i["name"] for i in response.json()]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(read, range(16)))
+    db.rollback()
+
+    for elapsed, names in results:
+        # Readers see the last commit, without waiting out the busy timeout
+        assert names == ["salt"]
+        assert elapsed < settings.sqlite_busy_timeout_ms / 1000 / 2
+
+
+def test_concurrent_writers_and_readers_do_not_fail(client):
+    errors: list[str] = []
+    start = threading.Barrier(12)
+
+    def write(worker: int) -> None:
+        writer = TestClient(app)
+        start.wait()
+        for i in range(15):
+            response = writer.post(
+                "/api/ingredients", json={"name": f"ingredient {worker} {i}"}
+            )
+            if response.status_code != 201:
+                errors.append(response.text)
+
+    def read(_) -> None:
+        reader = TestClient(app)
+        start.wait()
+        for _ in range(15):
+            response = reader.get("/api/ingredients")
+            if response.status_code != 200:
+                errors.append(response.text)
+
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        futures = [pool.submit(write, w) for w in range(6)]
+        futures += [pool.submit(read, r) for r in range(6)]
+        for future in futures:
+            future.result()  # re-raises "database is locked" from a thread
+
+    assert errors == []
+    assert len(client.get("/api/ingredients").json()) == 6 * 15
@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.recipe import Recipe
+from app.services.tool_executor import (
+    execute_add_to_plan,
+    execute_create_recipe,
+    execute_update_recipe,
+)
+
+SAVED = datetime(2026, 1, 3, 12, 0, 0)
+
+
+def _create(db, name: str) -> int:
+    result = execute_create_recipe(
+        db, {"name": name, "instructions": "", "ingredients": []}
+    )
+    return result["recipe_id"]
+
+
+def test_update_matches_a_close_spelling(db):
+    recipe_id = _create(db, "Spaghetti Bolognese")
+
+    result = execute_update_recipe(
+        db, {"recipe_name": "spagetti bolognese", "new_name": "Weeknight ragu"}
+    )
+
+    assert result["recipe_id"] == recipe_id
+    assert result["recipe_name"] == "Weeknight ragu"
+    assert result["matched_recipe_name"] == "Spaghetti Bolognese"
+
+
+@pytest.mark.parametrize("name", ["green pepper", "lasagne"])
+def test_write_tools_reject_distant_names(db, name):
+    _create(db, "Red pepper")
+    _create(db, "Lasagna")
+
+    with pytest.raises(ValueError, match="not found"):
+        execute_update_recipe(db, {"recipe_name": name, "servings": 4})
+    with pytest.raises(ValueError, match="not found"):
+        execute_add_to_plan(db, {"recipe_name": name, "date": "2026-01-03"})
+
+
+def test_write_tools_reject_ambiguous_names(db):
+    _create(db, "Chicken curry soup")
+    _create(db, "Chicken curry rice")
+
+    candidates = "'Chicken curry rice', 'Chicken curry soup'"
+    with pytest.raises(ValueError, match=f"ambiguous.*{candidates}"):
+        execute_update_recipe(db, {"recipe_name": "chicken curry", "servings": 4})
+
+
+def test_tag_only_update_bumps_updated_at(db):
+    recipe_id = _create(db, "Pancakes")
+    recipe = db.get(Recipe, recipe_id)
+    recipe.updated_at = SAVED
+    db.commit()
+
+    execute_update_recipe(db, {"recipe_name": "Pancakes", "tags": ["Breakfast"]})
+
+    db.expire_all()
+    assert db.get(Recipe, recipe_id).updated_at > SAVED
@@ -9,6 +9,8 @@ import type {
   Recipe,
   RecipeCreateInput,
   RecipeSummary,
+  SlotBatchResult,
+  SlotOperation,
   WeekPlan,
 } from "../types";
 
@@ -31,6 +33,11 @@ export const fetchIngredients = (search?: string) =>
     `/api/ingredients${search ? `?search=${encodeURIComponent(search)}` : ""}`,
   );
 
+export const autocompleteIngredients = (q: string, limit = 10) =>
+  request<Ingredient[]>(
+    `/api/ingredients/autocomplete?q=${encodeURIComponent(q)}&limit=${limit}`,
+  );
+
 export const createIngredient = (data: {
   name: string;
   category: string;
@@ -68,6 +75,9 @@ export const deleteRecipe = (id: number) =>
 export const fetchWeekPlan = (weekStart: string) =>
   request<WeekPlan | null>(`/api/meal-plans?week_start=${weekStart}`);
 
+export const fetchWeekPlansInRange = (from: string, to: string) =>
+  request<WeekPlan[]>(`/api/meal-plans/range?from=${from}&to=${to}`);
+
 export const createWeekPlan = (data: { week_start: string; notes?: string }) =>
   request<WeekPlan>("/api/meal-plans", {
     method: "POST",
@@ -101,6 +111,12 @@ export const deleteMealSlot = (planId: number, slotId: number) =>
     method: "DELETE",
   });
 
+export const applySlotBatch = (operations: SlotOperation[]) =>
+  request<SlotBatchResult>("/api/meal-plans/slots/batch", {
+    method: "POST",
+    body: JSON.stringify({ operations }),
+  });
+
 // Grocery
 export const fetchGroceryList = (planId: number) =>
   request<GroceryList>(`/api/meal-plans/${planId}/grocery-list`);
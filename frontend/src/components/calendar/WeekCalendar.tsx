@@ -1,4 +1,4 @@
-import { useQueries, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import {
   startOfMonth,
   endOfMonth,
@@ -22,10 +22,10 @@ import { useState, useMemo } from "react";
 import { useNavigate } from "react-router-dom";
 import {
   addMealSlot,
+  applySlotBatch,
   createWeekPlan,
   deleteMealSlot,
-  fetchWeekPlan,
-  updateMealSlot,
+  fetchWeekPlansInRange,
 } from "../../api";
 import type { MealSlot, RecipeSummary, WeekPlan } from "../../types";
 import Button from "../ui/Button";
@@ -57,29 +57,22 @@ export default function MonthCalendar({
     useSensor(PointerSensor, { activationConstraint: { distance: 8 } }),
   );
 
-  // Compute grid dates and week starts
-  const { days, weekStartDates } = useMemo(() => {
+  // Compute grid dates
+  const days = useMemo(() => {
     const monthStart = startOfMonth(currentMonth);
     const monthEnd = endOfMonth(currentMonth);
     const gridStart = startOfWeek(monthStart, { weekStartsOn: 6 });
     const gridEnd = endOfWeek(monthEnd, { weekStartsOn: 6 });
 
-    const allDays = eachDayOfInterval({ start: gridStart, end: gridEnd });
-
-    const starts: string[] = [];
-    for (let i = 0; i < allDays.length; i += 7) {
-      starts.push(format(allDays[i], "yyyy-MM-dd"));
-    }
-
-    return { days: allDays, weekStartDates: starts };
+    return eachDayOfInterval({ start: gridStart, end: gridEnd });
   }, [currentMonth]);
 
-  // Query all relevant week plans
-  const weekPlanQueries = useQueries({
-    queries: weekStartDates.map((ws) => ({
-      queryKey: ["weekPlan", ws],
-      queryFn: () => fetchWeekPlan(ws),
-    })),
+  // Load every week plan in the grid with one request
+  const gridStartStr = format(days[0], "yyyy-MM-dd");
+  const gridEndStr = format(days[days.length - 1], "yyyy-MM-dd");
+  const { data: weekPlans = [], isLoading } = useQuery({
+    queryKey: ["weekPlan", "range", gridStartStr, gridEndStr],
+    queryFn: () => fetchWeekPlansInRange(gridStartStr, gridEndStr),
   });
 
   // Build slot lookup and plan lookup
@@ -87,23 +80,21 @@ export default function MonthCalendar({
     const sbd: Record<string, MealSlot[]> = {};
     const pws: Record<string, WeekPlan> = {};
 
-    weekPlanQueries.forEach((query, idx) => {
-      const plan = query.data;
-      if (!plan) return;
-      pws[weekStartDates[idx]] = plan;
+    for (const plan of weekPlans) {
+      pws[plan.week_start] = plan;
 
       for (const slot of plan.slots) {
         if (!sbd[slot.date]) sbd[slot.date] = [];
         sbd[slot.date].push(slot);
       }
-    });
+    }
 
     for (const date of Object.keys(sbd)) {
       sbd[date].sort((a, b) => a.sort_order - b.sort_order);
     }
 
     return { slotsByDate: sbd, planForWeekStart: pws };
-  }, [weekPlanQueries, weekStartDates]);
+  }, [weekPlans]);
 
   const getWeekStartForDate = (dateStr: string) => {
     const d = new Date(dateStr + "T00:00:00");
@@ -118,9 +109,7 @@ export default function MonthCalendar({
   };
 
   const invalidateAll = () => {
-    weekStartDates.forEach((ws) =>
-      queryClient.invalidateQueries({ queryKey: ["weekPlan", ws] }),
-    );
+    queryClient.invalidateQueries({ queryKey: ["weekPlan"] });
   };
 
   const addSlotMutation = useMutation({
@@ -143,17 +132,32 @@ export default function MonthCalendar({
     onSuccess: invalidateAll,
   });
 
-  const updateSlotMutation = useMutation({
-    mutationFn: async ({
-      slot,
-      data,
-    }: {
-      slot: MealSlot;
-      data: Partial<MealSlot>;
-    }) => {
-      return updateMealSlot(slot.week_plan_id, slot.id, data);
-    },
-    onSuccess: invalidateAll,
+  const toggleLeftoverMutation = useMutation({
+    mutationFn: async (slot: MealSlot) =>
+      applySlotBatch([
+        {
+          op: "update",
+          slot_id: slot.id,
+          version: slot.version,
+          changes: { is_leftover: !slot.is_leftover },
+        },
+      ]),
+    onSettled: invalidateAll,
+  });
+
+  const moveSlotMutation = useMutation({
+    mutationFn: async ({ slot, date }: { slot: MealSlot; date: string }) =>
+      // The server files the slot under the new date's week plan
+      applySlotBatch([
+        {
+          op: "move",
+          slot_id: slot.id,
+          version: slot.version,
+          date,
+          sort_order: (slotsByDate[date] || []).length,
+        },
+      ]),
+    onSettled: invalidateAll,
   });
 
   const deleteSlotMutation = useMutation({
@@ -191,11 +195,9 @@ export default function MonthCalendar({
     }
     if (!foundSlot || foundSlot.date === targetDate) return;
 
-    updateSlotMutation.mutate({ slot: foundSlot, data: { date: targetDate } });
+    moveSlotMutation.mutate({ slot: foundSlot, date: targetDate });
   };
 
-  const isLoading = weekPlanQueries.some((q) => q.isLoading);
-
   return (
     <div>
       <div className="flex items-center justify-between mb-4">
@@ -250,12 +252,7 @@ export default function MonthCalendar({
                   isToday={today}
                   slots={slots}
                   onAddMeal={() => setPickerTarget(dateStr)}
-                  onToggleLeftover={(slot) =>
-                    updateSlotMutation.mutate({
-                      slot,
-                      data: { is_leftover: !slot.is_leftover },
-                    })
-                  }
+                  onToggleLeftover={(slot) => toggleLeftoverMutation.mutate(slot)}
                   onDeleteSlot={(slot) => deleteSlotMutation.mutate(slot)}
                   onViewRecipe={(recipeId) => navigate(`/recipes/${recipeId}`)}
                 />
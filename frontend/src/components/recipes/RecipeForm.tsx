@@ -1,9 +1,9 @@
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import { useState, useEffect } from "react";
 import {
+  autocompleteIngredients,
   createIngredient,
   createRecipe,
-  fetchIngredients,
   fetchRecipe,
   updateRecipe,
 } from "../../api";
@@ -32,9 +32,9 @@ export default function RecipeForm({ recipeId, onDone }: Props) {
   const [ingredientSearch, setIngredientSearch] = useState("");
 
   const { data: availableIngredients = [] } = useQuery({
-    queryKey: ["ingredients", ingredientSearch],
-    queryFn: () => fetchIngredients(ingredientSearch || undefined),
-    enabled: ingredientSearch.length > 0,
+    queryKey: ["ingredients", "autocomplete", ingredientSearch],
+    queryFn: () => autocompleteIngredients(ingredientSearch),
+    enabled: ingredientSearch.trim().length > 0,
   });
 
   // Load existing recipe for editing
@@ -3,6 +3,8 @@ export interface Ingredient {
   name: string;
   category: string;
   default_unit: string;
+  density: number | null;
+  unit_weight: number | null;
 }
 
 export interface RecipeIngredient {
@@ -70,6 +72,7 @@ export interface MealSlot {
   notes: string | null;
   sort_order: number;
   recipe_name: string | null;
+  version: number;
 }
 
 export interface MealSlotInput {
@@ -82,6 +85,29 @@ export interface MealSlotInput {
   sort_order?: number;
 }
 
+export type SlotOperation =
+  | { op: "create"; week_plan_id?: number; slot: MealSlotInput }
+  | {
+      op: "update";
+      slot_id: number;
+      version: number;
+      changes: Partial<MealSlotInput>;
+    }
+  | {
+      op: "move";
+      slot_id: number;
+      version: number;
+      date: string;
+      sort_order?: number;
+      week_plan_id?: number;
+    }
+  | { op: "delete"; slot_id: number; version: number };
+
+export interface SlotBatchResult {
+  slots: MealSlot[];
+  deleted: number[];
+}
+
 export interface WeekPlan {
   id: number;
   week_start: string;
@@ -125,4 +151,4 @@ export type ChatStreamEvent =
   | { type: "tool_start"; tool: string; label: string }
   | { type: "tool_done"; tool: string; result: Record<string, unknown> }
   | { type: "tool_error"; tool: string; error: string }
-  | { type: "done" };
+  | { type: "done"; first_token_ms: number | null };